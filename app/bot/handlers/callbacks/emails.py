@@ -106,14 +106,6 @@ async def handle_email_action_callback(
             thread_id=thread_id,
             draft_type="reply",
             from_identity_email=from_email,
-        )
-        signature_choice = normalize_signature_choice(
-            account.get("signature"),
-            get_account_last_signature_choice(account_id=int(account_id)),
-        )
-        set_draft_signature_choice(draft_id=int(draft_id), choice=signature_choice)
-        db.update_draft(
-            draft_id=draft_id,
             updates={
                 "to_addrs": to_email,
                 "subject": subject,
@@ -121,6 +113,11 @@ async def handle_email_action_callback(
                 "references_header": orig_message_id or None,
             },
         )
+        signature_choice = normalize_signature_choice(
+            account.get("signature"),
+            get_account_last_signature_choice(account_id=int(account_id)),
+        )
+        set_draft_signature_choice(draft_id=int(draft_id), choice=signature_choice)
 
         draft = db.get_active_draft(chat_id=chat_id, thread_id=thread_id)
         signature_label = format_signature_choice_label(
@@ -253,20 +250,17 @@ async def handle_email_action_callback(
             thread_id=thread_id,
             draft_type="forward",
             from_identity_email=from_email,
-        )
-        signature_choice = normalize_signature_choice(
-            account.get("signature"),
-            get_account_last_signature_choice(account_id=int(account_id)),
-        )
-        set_draft_signature_choice(draft_id=int(draft_id), choice=signature_choice)
-        db.update_draft(
-            draft_id=draft_id,
             updates={
                 "to_addrs": "",
                 "subject": draft_subject,
                 "body_markdown": forward_body,
             },
         )
+        signature_choice = normalize_signature_choice(
+            account.get("signature"),
+            get_account_last_signature_choice(account_id=int(account_id)),
+        )
+        set_draft_signature_choice(draft_id=int(draft_id), choice=signature_choice)
 
         draft = db.get_active_draft(chat_id=chat_id, thread_id=thread_id)
         signature_label = format_signature_choice_label(
@@ -1,14 +1,13 @@
 from typing import Any, Optional
 from aiotdlib import Client
 from aiotdlib.api import UpdateNewMessage
-import asyncio
 from app.bot.handlers.access import validate_admin
 from app.bot.utils import send_and_delete_message
 from app.i18n import _
 from app.utils import Logger
 from app.cron.email_ingestion import (
     fetch_account_emails,
-    fetch_account_emails_safe,
+    iter_accounts_emails_safe,
 )
 from app.email_utils.account_manager import AccountManager
 from app.bot.conversation import Conversation
@@ -173,23 +172,9 @@ async def fetch_emails_action(
         return False, str(e)
 
 
-async def _fetch_email_for_account(account: dict[str, Any]) -> tuple[str, int, str]:
-    """
-    Fetch emails for a single account
-
-    Args:
-        email: Email address to fetch from
-
-    Returns:
-        Tuple of (email address, email count, error message)
-        Error message is empty if successful
-    """
-    return await fetch_account_emails_safe(account)
-
-
 async def fetch_all_emails_action(context: dict) -> tuple[bool, str]:
     """
-    fetch emails for all email accounts concurrently
+    fetch emails for all email accounts concurrently (bounded by IMAP_FETCH_CONCURRENCY)
 
     Args:
         context: conversation context
@@ -201,19 +186,11 @@ async def fetch_all_emails_action(context: dict) -> tuple[bool, str]:
         account_manager = AccountManager()
         accounts = account_manager.get_all_accounts()
 
-        # Create fetch tasks for all accounts
-        fetch_tasks = []
-        for account in accounts:
-            fetch_tasks.append(_fetch_email_for_account(account))
-
-        # Run all fetch tasks concurrently
-        results = await asyncio.gather(*fetch_tasks)
-
-        # Process results
+        # Fetch accounts concurrently (bounded) and process results as they finish
         total_count = 0
         emails_info = {}
 
-        for email, count, error in results:
+        async for email, count, error in iter_accounts_emails_safe(accounts):
             if error:
                 emails_info[email] = f"Error: {error}"
             else:
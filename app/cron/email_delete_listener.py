@@ -1,6 +1,6 @@
 import asyncio
 import os
-from typing import Set
+from typing import List, Set, Tuple
 from aiotdlib.api import (
     ChatEventLogFilters,
 )
@@ -41,6 +41,7 @@ async def check_deleted_topics_for_group(chat_id):
             )
             request_timeout = 30
         seen_event_ids: Set[int] = set()
+        deleted_topics: List[Tuple[str, int, int]] = []
         while True:
             events = None
             for attempt in range(1, 4):
@@ -94,17 +95,9 @@ async def check_deleted_topics_for_group(chat_id):
                     continue
 
                 topic_info = event.action.topic_info
-                thread_id = str(topic_info.message_thread_id)
-                ok = db_manager.upsert_deleted_topic(
-                    chat_id=chat_id,
-                    thread_id=thread_id,
-                    event_id=event_id,
-                    deleted_at=int(event.date),
+                deleted_topics.append(
+                    (str(topic_info.message_thread_id), event_id, int(event.date))
                 )
-                if not ok:
-                    raise RuntimeError(
-                        f"Failed to persist deleted topic (chat_id={chat_id}, thread_id={thread_id})"
-                    )
 
             if reached_cursor:
                 break
@@ -119,8 +112,21 @@ async def check_deleted_topics_for_group(chat_id):
                 break
             from_event_id = oldest_event_id
 
-        if newest_seen_event_id > last_event_id:
-            db_manager.set_chat_event_cursor(chat_id, newest_seen_event_id)
+        # Persist the whole scan (deleted topics + new cursor) in one transaction.
+        if deleted_topics or newest_seen_event_id > last_event_id:
+            ok = db_manager.upsert_deleted_topics_batch(
+                chat_id,
+                deleted_topics,
+                last_event_id=(
+                    newest_seen_event_id
+                    if newest_seen_event_id > last_event_id
+                    else None
+                ),
+            )
+            if not ok:
+                raise RuntimeError(
+                    f"Failed to persist {len(deleted_topics)} deleted topics (chat_id={chat_id})"
+                )
 
         # Process all pending deleted topics (including ones recorded on previous runs).
         pending_topics = db_manager.list_pending_deleted_topics(chat_id)
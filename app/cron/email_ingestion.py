@@ -1,5 +1,7 @@
-from typing import Any
+import asyncio
+from typing import Any, AsyncIterator, Iterable, Optional
 
+from app.cron.email_receive_config import get_imap_fetch_concurrency
 from app.email_utils.imap_client import IMAPClient
 from app.utils import Logger
 
@@ -19,3 +21,34 @@ async def fetch_account_emails_safe(account: dict[str, Any]) -> tuple[str, int,
     except Exception as e:
         logger.error(f"Error fetching emails for {email_addr}: {e}")
         return email_addr, 0, str(e)
+
+
+async def iter_accounts_emails_safe(
+    accounts: Iterable[dict[str, Any]], max_concurrency: Optional[int] = None
+) -> AsyncIterator[tuple[str, int, str]]:
+    """
+    Fetch several accounts with at most `max_concurrency` IMAP sessions open.
+
+    Yields (email, count, error) tuples as each account finishes, so a slow
+    server does not hold back results from the fast ones. Fetches still
+    pending when the consumer stops iterating (or is cancelled) are cancelled.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or get_imap_fetch_concurrency())
+
+    async def _bounded(account: dict[str, Any]) -> tuple[str, int, str]:
+        async with semaphore:
+            return await fetch_account_emails_safe(account)
+
+    tasks = [
+        asyncio.create_task(_bounded(a), name=f"fetch:{a.get('email', '')}")
+        for a in accounts
+    ]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        pending = [t for t in tasks if not t.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -1,4 +1,6 @@
+import functools
 import os
+from typing import Callable, TypeVar
 
 from app.utils import Logger
 
@@ -11,8 +13,40 @@ VALID_MAIL_RECEIVE_MODES = {"polling", "idle", "hybrid"}
 DEFAULT_IMAP_IDLE_TIMEOUT_SECONDS = 1740
 DEFAULT_IMAP_IDLE_FALLBACK_POLL_SECONDS = 30
 DEFAULT_IMAP_IDLE_RECONNECT_BACKOFF_SECONDS = 5
+DEFAULT_IMAP_FETCH_CONCURRENCY = 8
 
+_T = TypeVar("_T")
+_UNSET = object()
 
+
+def _cached_on_env(name: str) -> Callable[[Callable[[], _T]], Callable[[], _T]]:
+    """
+    Cache a config getter's result until the raw value of env var `name` changes.
+
+    The getters run on every polling tick / IDLE reconnect; this skips the
+    re-parse (and repeated invalid-value warnings) while still picking up
+    runtime changes to the environment.
+    """
+
+    def decorator(func: Callable[[], _T]) -> Callable[[], _T]:
+        cached_raw: object = _UNSET
+        cached_value: _T
+
+        @functools.wraps(func)
+        def wrapper() -> _T:
+            nonlocal cached_raw, cached_value
+            raw = os.getenv(name)
+            if raw != cached_raw:
+                cached_value = func()
+                cached_raw = raw
+            return cached_value
+
+        return wrapper
+
+    return decorator
+
+
+@_cached_on_env("POLLING_INTERVAL")
 def get_polling_interval_seconds() -> int:
     raw = (os.getenv("POLLING_INTERVAL") or "").strip()
     if not raw:
@@ -35,6 +69,7 @@ def get_polling_interval_seconds() -> int:
     return value
 
 
+@_cached_on_env("MAIL_RECEIVE_MODE")
 def get_mail_receive_mode() -> str:
     raw = (os.getenv("MAIL_RECEIVE_MODE") or "").strip().lower()
     if not raw:
@@ -66,12 +101,14 @@ def _parse_int_env_with_min(name: str, default: int, min_value: int) -> int:
     return value
 
 
+@_cached_on_env("IMAP_IDLE_TIMEOUT_SECONDS")
 def get_imap_idle_timeout_seconds() -> int:
     return _parse_int_env_with_min(
         "IMAP_IDLE_TIMEOUT_SECONDS", DEFAULT_IMAP_IDLE_TIMEOUT_SECONDS, min_value=10
     )
 
 
+@_cached_on_env("IMAP_IDLE_FALLBACK_POLL_SECONDS")
 def get_imap_idle_fallback_poll_seconds() -> int:
     return _parse_int_env_with_min(
         "IMAP_IDLE_FALLBACK_POLL_SECONDS",
@@ -80,9 +117,19 @@ def get_imap_idle_fallback_poll_seconds() -> int:
     )
 
 
+@_cached_on_env("IMAP_IDLE_RECONNECT_BACKOFF_SECONDS")
 def get_imap_idle_reconnect_backoff_seconds() -> int:
     return _parse_int_env_with_min(
         "IMAP_IDLE_RECONNECT_BACKOFF_SECONDS",
         DEFAULT_IMAP_IDLE_RECONNECT_BACKOFF_SECONDS,
         min_value=1,
     )
+
+
+@_cached_on_env("IMAP_FETCH_CONCURRENCY")
+def get_imap_fetch_concurrency() -> int:
+    return _parse_int_env_with_min(
+        "IMAP_FETCH_CONCURRENCY",
+        DEFAULT_IMAP_FETCH_CONCURRENCY,
+        min_value=1,
+    )
@@ -24,21 +24,40 @@ def get_db_path() -> str:
     return os.getenv("TELEGRAMAIL_DB_PATH") or DEFAULT_DB_PATH
 
 
+_SQLITE_SYNCHRONOUS_LEVELS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def get_db_synchronous() -> str:
+    """
+    Resolve the per-connection PRAGMA synchronous level (default NORMAL).
+
+    TELEGRAMAIL_DB_SYNCHRONOUS is test-only: the suite sets it to OFF since its
+    throwaway databases don't need durability. Leave it unset in production.
+    """
+    level = (os.getenv("TELEGRAMAIL_DB_SYNCHRONOUS") or "").strip().upper()
+    return level if level in _SQLITE_SYNCHRONOUS_LEVELS else "NORMAL"
+
+
 @Singleton
 class DBManager(TopicTrackingMixin, DraftsMixin, EmailLabelsMixin):
     """Database manager for handling email operations"""
 
     def __init__(self):
         """Initialize database manager"""
+        self._db_path = get_db_path()
+        self._synchronous_pragma = f"PRAGMA synchronous={get_db_synchronous()}"
         # check if database exists
         self._initialize_db()
 
     def _initialize_db(self) -> None:
         """Initialize database with required tables"""
-        db_path = get_db_path()
+        db_path = self._db_path
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
         conn = sqlite3.connect(db_path)
+        # WAL allows concurrent readers alongside a writer. The journal mode is
+        # persistent in the database file, so per-call connections need not set it.
+        conn.execute("PRAGMA journal_mode=WAL")
         cursor = conn.cursor()
 
         # Create accounts and email table if not exists
@@ -196,6 +215,15 @@ CREATE TABLE IF NOT EXISTS draft_messages (
         if "references_header" not in draft_columns:
             cursor.execute("ALTER TABLE drafts ADD COLUMN references_header TEXT")
 
+        # Drafts: active-draft lookup by topic (get_active_draft).
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_drafts_chat_thread_status
+            ON drafts (chat_id, thread_id, status)
+            WHERE status = 'open'
+            """
+        )
+
         conn.commit()
         conn.close()
 
@@ -206,15 +234,14 @@ CREATE TABLE IF NOT EXISTS draft_messages (
         Returns:
             sqlite3.Connection: SQLite database connection
         """
-        # Set timeout (in seconds) for acquiring a lock
-        # Use WAL mode to reduce locking issues
-        conn = sqlite3.connect(get_db_path())
-
-        # Enable WAL mode which allows concurrent reads
-        conn.execute("PRAGMA journal_mode=WAL")
-
-        # Set busy timeout (milliseconds) - how long to wait when db is locked
-        conn.execute("PRAGMA busy_timeout=10000")
+        # timeout (seconds) installs the busy handler: how long to wait when the
+        # db is locked. WAL mode is already set on the file by _initialize_db.
+        # The path is fixed at construction so reset_instance(db_path) can keep
+        # an instance bound to it.
+        conn = sqlite3.connect(self._db_path, timeout=10.0)
+
+        # In WAL mode NORMAL is still corruption-safe and skips the fsync per commit.
+        conn.execute(self._synchronous_pragma)
 
         return conn
 
@@ -6,6 +6,21 @@ from app.utils import Logger
 
 logger = Logger().get_logger(__name__)
 
+_DRAFT_UPDATABLE_COLUMNS = frozenset(
+    {
+        "from_identity_email",
+        "card_message_id",
+        "to_addrs",
+        "cc_addrs",
+        "bcc_addrs",
+        "subject",
+        "in_reply_to",
+        "references_header",
+        "body_markdown",
+        "status",
+    }
+)
+
 
 class DraftsMixin:
     # --- Drafts ---
@@ -18,26 +33,39 @@ class DraftsMixin:
         thread_id: int,
         draft_type: str,
         from_identity_email: str,
+        updates: Optional[Dict[str, Any]] = None,
     ) -> int:
+        """
+        Insert a new open draft.
+
+        `updates` accepts the same columns as `update_draft` and is written in the
+        same INSERT, saving a follow-up UPDATE + commit.
+        """
         now = int(time.time())
+        columns = {
+            "account_id": int(account_id),
+            "chat_id": int(chat_id),
+            "thread_id": int(thread_id),
+            "draft_type": (draft_type or "compose").strip(),
+            "from_identity_email": (from_identity_email or "").strip().lower(),
+            "status": "open",
+        }
+        for key, value in (updates or {}).items():
+            if key in _DRAFT_UPDATABLE_COLUMNS:
+                columns[key] = value
+        columns["created_at"] = now
+        columns["updated_at"] = now
+
         conn = self._get_connection()
         cursor = conn.cursor()
         cursor.execute(
-            """
+            f"""
             INSERT INTO drafts
-              (account_id, chat_id, thread_id, draft_type, from_identity_email, status, created_at, updated_at)
+              ({", ".join(columns.keys())})
             VALUES
-              (?, ?, ?, ?, ?, 'open', ?, ?)
+              ({", ".join(["?"] * len(columns))})
             """,
-            (
-                int(account_id),
-                int(chat_id),
-                int(thread_id),
-                (draft_type or "compose").strip(),
-                (from_identity_email or "").strip().lower(),
-                now,
-                now,
-            ),
+            list(columns.values()),
         )
         draft_id = cursor.lastrowid
         conn.commit()
@@ -70,19 +98,9 @@ class DraftsMixin:
     def update_draft(self, *, draft_id: int, updates: Dict[str, Any]) -> bool:
         if not updates:
             return True
-        allowed = {
-            "from_identity_email",
-            "card_message_id",
-            "to_addrs",
-            "cc_addrs",
-            "bcc_addrs",
-            "subject",
-            "in_reply_to",
-            "references_header",
-            "body_markdown",
-            "status",
+        filtered = {
+            k: v for k, v in updates.items() if k in _DRAFT_UPDATABLE_COLUMNS
         }
-        filtered = {k: v for k, v in updates.items() if k in allowed}
         if not filtered:
             return True
 
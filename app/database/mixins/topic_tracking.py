@@ -1,11 +1,26 @@
 import sqlite3
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from app.utils import Logger
 
 logger = Logger().get_logger(__name__)
 
 
+_UPSERT_DELETED_TOPIC_SQL = """
+INSERT INTO deleted_topics (chat_id, thread_id, event_id, deleted_at, processed_at, attempts, last_error)
+VALUES (?, ?, ?, ?, NULL, 0, NULL)
+ON CONFLICT(chat_id, thread_id) DO UPDATE SET
+    event_id = excluded.event_id,
+    deleted_at = excluded.deleted_at
+"""
+
+_UPSERT_CHAT_EVENT_CURSOR_SQL = """
+INSERT INTO chat_event_cursors (chat_id, last_forum_event_id)
+VALUES (?, ?)
+ON CONFLICT(chat_id) DO UPDATE SET last_forum_event_id = excluded.last_forum_event_id
+"""
+
+
 class TopicTrackingMixin:
     def get_chat_event_cursor(self, chat_id: int) -> int:
         """
@@ -46,12 +61,7 @@ class TopicTrackingMixin:
             conn = self._get_connection()
             cursor = conn.cursor()
             cursor.execute(
-                """
-                INSERT INTO chat_event_cursors (chat_id, last_forum_event_id)
-                VALUES (?, ?)
-                ON CONFLICT(chat_id) DO UPDATE SET last_forum_event_id = excluded.last_forum_event_id
-                """,
-                (int(chat_id), int(event_id)),
+                _UPSERT_CHAT_EVENT_CURSOR_SQL, (int(chat_id), int(event_id))
             )
             conn.commit()
             conn.close()
@@ -77,25 +87,51 @@ class TopicTrackingMixin:
         Returns:
             bool: True if successful, False otherwise.
         """
+        return self.upsert_deleted_topics_batch(
+            chat_id, [(thread_id, event_id, deleted_at)]
+        )
+
+    def upsert_deleted_topics_batch(
+        self,
+        chat_id: int,
+        topics: Sequence[Tuple[str, int, int]],
+        last_event_id: Optional[int] = None,
+    ) -> bool:
+        """
+        Record several deleted topics and optionally advance the event cursor in one transaction.
+
+        Args:
+            chat_id: Telegram group chat ID.
+            topics: (thread_id, event_id, deleted_at) tuples, applied in order.
+            last_event_id: New chat event cursor; left unchanged when None.
+
+        Returns:
+            bool: True if successful, False otherwise (nothing is written on failure).
+        """
+        if not topics and last_event_id is None:
+            return True
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO deleted_topics (chat_id, thread_id, event_id, deleted_at, processed_at, attempts, last_error)
-                VALUES (?, ?, ?, ?, NULL, 0, NULL)
-                ON CONFLICT(chat_id, thread_id) DO UPDATE SET
-                    event_id = excluded.event_id,
-                    deleted_at = excluded.deleted_at
-                """,
-                (int(chat_id), str(thread_id), int(event_id), int(deleted_at)),
-            )
-            conn.commit()
-            conn.close()
+            try:
+                with conn:
+                    conn.executemany(
+                        _UPSERT_DELETED_TOPIC_SQL,
+                        [
+                            (int(chat_id), str(thread_id), int(event_id), int(deleted_at))
+                            for thread_id, event_id, deleted_at in topics
+                        ],
+                    )
+                    if last_event_id is not None:
+                        conn.execute(
+                            _UPSERT_CHAT_EVENT_CURSOR_SQL,
+                            (int(chat_id), int(last_event_id)),
+                        )
+            finally:
+                conn.close()
             return True
         except Exception as e:
             logger.error(
-                f"Error upserting deleted topic (chat_id={chat_id}, thread_id={thread_id}): {e}"
+                f"Error upserting {len(topics)} deleted topics for chat {chat_id}: {e}"
             )
             return False
 
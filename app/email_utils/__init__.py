@@ -2,6 +2,7 @@ from app.email_utils.text import (
     decode_email_subject,
     decode_email_address,
     clean_html_content,
+    extract_unsubscribe_from_header,
     extract_unsubscribe_urls,
 )
 from app.email_utils.imap_client import IMAPClient
@@ -14,6 +15,7 @@ __all__ = [
     "decode_email_subject",
     "decode_email_address",
     "clean_html_content",
+    "extract_unsubscribe_from_header",
     "extract_unsubscribe_urls",
     "IMAPClient",
     "ConnectionFactory",
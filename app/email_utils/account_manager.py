@@ -12,6 +12,7 @@ class AccountManager:
 
     def __init__(self):
         self.db_manager = DBManager()
+        self._db_path = self.db_manager._db_path
 
     def add_account(self, account: Dict[str, Any]) -> bool:
         """
@@ -1,4 +1,5 @@
 import email.utils
+import functools
 from email.message import Message
 from typing import Iterable, Optional
 
@@ -16,10 +17,13 @@ def _normalize_email_address(addr: str) -> str:
     return (addr or "").strip().lower()
 
 
+@functools.lru_cache(maxsize=4096)
 def normalize_plus_address(addr: str) -> tuple[str, str]:
     """
     Return (raw, base) where base strips "+tag" from the local-part.
 
+    Cached: the same Delivered-To/identity addresses recur on every message.
+
     Example:
       "b+tag@example.com" -> ("b+tag@example.com", "b@example.com")
     """
@@ -43,19 +47,41 @@ def extract_delivered_to_candidates(msg: Message) -> list[str]:
     if msg is None:
         return []
 
-    results: list[str] = []
-    seen: set[str] = set()
-
+    raw_values: list[str] = []
     for header in DELIVERED_TO_HEADERS:
-        for raw_value in msg.get_all(header, []) or []:
-            for _name, addr in email.utils.getaddresses([raw_value]):
-                normalized = _normalize_email_address(addr)
-                if not normalized or normalized in seen:
-                    continue
-                seen.add(normalized)
-                results.append(normalized)
+        raw_values.extend(msg.get_all(header, []) or [])
+    if not raw_values:
+        return []
+
+    # Parse each header value on its own: getaddresses() comma-joins its
+    # inputs, so one malformed value would otherwise swallow the rest.
+    # dict.fromkeys de-duplicates while keeping first-occurrence (priority) order.
+    normalized = (
+        _normalize_email_address(addr)
+        for value in raw_values
+        for _name, addr in email.utils.getaddresses([value])
+    )
+    return list(dict.fromkeys(addr for addr in normalized if addr))
+
 
-    return results
+def _normalized_identity_set(identity_emails: frozenset[str]) -> set[str]:
+    return {_normalize_email_address(e) for e in identity_emails}
+
+
+@functools.lru_cache(maxsize=2048)
+def _choose_recommended_from_cached(
+    candidates: tuple[str, ...], identity_emails: frozenset[str], default_email: str
+) -> str:
+    identity_set = _normalized_identity_set(identity_emails)
+
+    for candidate in candidates:
+        raw, base = normalize_plus_address(candidate)
+        if raw in identity_set:
+            return raw
+        if base in identity_set:
+            return base
+
+    return _normalize_email_address(default_email)
 
 
 def choose_recommended_from(
@@ -72,29 +98,18 @@ def choose_recommended_from(
       - Else, if it's a plus address and base matches identity, use base.
       - Else, fall back to default_email.
     """
-    identity_set = {_normalize_email_address(e) for e in (identity_emails or set())}
-    default_norm = _normalize_email_address(default_email)
-
-    for candidate in candidates or []:
-        raw, base = normalize_plus_address(candidate)
-        if raw in identity_set:
-            return raw
-        if base in identity_set:
-            return base
-
-    return default_norm
+    return _choose_recommended_from_cached(
+        tuple(candidates or ()), frozenset(identity_emails or ()), default_email or ""
+    )
 
 
-def suggest_identity(*, candidates: Iterable[str], identity_emails: set[str]) -> Optional[str]:
-    """
-    Suggest a new From identity to add based on Delivered-To candidates.
-
-    - If candidate is plus-addressed and base is missing, suggest base.
-    - Else if candidate is missing, suggest candidate.
-    """
-    identity_set = {_normalize_email_address(e) for e in (identity_emails or set())}
+@functools.lru_cache(maxsize=2048)
+def _suggest_identity_cached(
+    candidates: tuple[str, ...], identity_emails: frozenset[str]
+) -> Optional[str]:
+    identity_set = _normalized_identity_set(identity_emails)
 
-    for candidate in candidates or []:
+    for candidate in candidates:
         raw, base = normalize_plus_address(candidate)
         if raw != base:
             if base not in identity_set:
@@ -105,3 +120,15 @@ def suggest_identity(*, candidates: Iterable[str], identity_emails: set[str]) ->
             return raw
 
     return None
+
+
+def suggest_identity(*, candidates: Iterable[str], identity_emails: set[str]) -> Optional[str]:
+    """
+    Suggest a new From identity to add based on Delivered-To candidates.
+
+    - If candidate is plus-addressed and base is missing, suggest base.
+    - Else if candidate is missing, suggest candidate.
+    """
+    return _suggest_identity_cached(
+        tuple(candidates or ()), frozenset(identity_emails or ())
+    )
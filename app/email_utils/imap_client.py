@@ -13,12 +13,23 @@ from app.email_utils.text import (
     decode_email_address,
     decode_email_subject,
     get_email_body,
+    has_plain_text_part,
 )
 from app.email_utils.identity import extract_delivered_to_candidates
 from app.utils.decorators import retry_on_fail
 
 logger = Logger().get_logger(__name__)
 
+# Characters that cannot appear in an unquoted IMAP mailbox name (RFC 3501 atom-specials
+# minus "]", which astrings allow).
+_IMAP_ATOM_SPECIALS = frozenset(' (){%*"\\')
+
+# One LIST response line: (attrs) delimiter name, with a quoted or bare
+# (e.g. NIL) hierarchy delimiter.
+_LIST_LINE_RE = re.compile(r'^\((?P<attrs>[^)]*)\)\s+(?:"[^"]+"|\S+)\s+(?P<name>.+)$')
+_NOSELECT_RE = re.compile(r"\\Noselect\b", re.IGNORECASE)
+_SENT_ATTR_RE = re.compile(r"\\Sent\b", re.IGNORECASE)
+
 
 class IMAPClient:
     """IMAP client for connecting to email servers and fetching emails"""
@@ -34,6 +45,8 @@ class IMAPClient:
         self.email_addr = account["email"]
         self.conn = None
         self.db_manager = DBManager()
+        # Sent mailbox resolved via LIST; kept across reconnects of this client.
+        self._sent_mailbox: str | None = None
 
     def connect(self) -> bool:
         """
@@ -113,10 +126,52 @@ class IMAPClient:
         escaped = (mailbox or "").replace("\\", "\\\\").replace('"', r"\"")
         return f'"{escaped}"'
 
+    @staticmethod
+    def _mailbox_needs_quoting(mailbox: str) -> bool:
+        """
+        Whether a mailbox name must be sent as an IMAP quoted string.
+
+        Names that are not plain astrings (spaces, parentheses, braces, wildcards,
+        quotes, backslashes, control chars) are rejected unquoted by many servers.
+        """
+        if not mailbox:
+            return True
+        return any(c in _IMAP_ATOM_SPECIALS or ord(c) < 0x20 for c in mailbox)
+
     @staticmethod
     def _normalize_message_id(message_id: Any) -> str:
         return str(message_id or "").strip().lower()
 
+    @staticmethod
+    def _parse_list_line(raw: Any) -> tuple[str, str] | None:
+        """
+        Parse one LIST response line into (attrs, mailbox name).
+
+        Unparseable lines fall back to treating the whole line as the name.
+        Returns None for empty or undecodable lines.
+        """
+        if not raw:
+            return None
+        try:
+            line = raw.decode("utf-8", errors="ignore").strip()
+        except Exception:
+            return None
+        if not line:
+            return None
+
+        m = _LIST_LINE_RE.match(line)
+        if m:
+            attrs = m.group("attrs").strip()
+            name = m.group("name").strip()
+        else:
+            attrs, name = "", line
+
+        if name.startswith('"') and name.endswith('"') and len(name) >= 2:
+            name = name[1:-1]
+        if not name:
+            return None
+        return attrs, name
+
     def list_mailboxes(self, *, selectable_only: bool = False) -> list[dict[str, Any]]:
         """
         List IMAP mailboxes for this account.
@@ -140,46 +195,17 @@ class IMAPClient:
             items: list[dict[str, Any]] = []
             seen: set[str] = set()
             for raw in data:
-                if not raw:
-                    continue
-                try:
-                    line = raw.decode("utf-8", errors="ignore").strip()
-                except Exception:
-                    continue
-                if not line:
-                    continue
-
-                attrs = ""
-                name = ""
-                m = re.match(
-                    r'^\((?P<attrs>[^)]*)\)\s+"(?P<delim>[^"]+)"\s+(?P<name>.+)$',
-                    line,
-                )
-                if not m:
-                    m = re.match(
-                        r"^\((?P<attrs>[^)]*)\)\s+(?P<delim>\S+)\s+(?P<name>.+)$",
-                        line,
-                    )
-
-                if m:
-                    attrs = (m.group("attrs") or "").strip()
-                    name = (m.group("name") or "").strip()
-                else:
-                    # Fallback: best-effort parse, treat the whole line as name.
-                    name = line.strip()
-
-                if name.startswith('"') and name.endswith('"') and len(name) >= 2:
-                    name = name[1:-1]
-
-                if not name:
+                parsed = self._parse_list_line(raw)
+                if parsed is None:
                     continue
+                attrs, name = parsed
 
                 key = name.lower()
                 if key in seen:
                     continue
                 seen.add(key)
 
-                selectable = not bool(re.search(r"\\Noselect\b", attrs, re.IGNORECASE))
+                selectable = not _NOSELECT_RE.search(attrs)
                 if selectable_only and not selectable:
                     continue
 
@@ -353,10 +379,14 @@ class IMAPClient:
                             "email_date": email_date,
                             "body_text": body_text,
                             "body_html": body_html,
+                            "has_plain_part": has_plain_text_part(msg),
+                            "list_unsubscribe": str(msg.get("List-Unsubscribe", "") or ""),
                             "uid": uid,
                             "mailbox": mailbox,
                             "delivered_to": json.dumps(delivered_to),
-                            "raw_email": raw_email,  # Store raw email for later processing
+                            # Keep the parsed message so phase 2 can walk attachments
+                            # without re-parsing the raw bytes.
+                            "parsed_msg": msg,
                         }
 
                         # Store email data for later processing
@@ -413,7 +443,7 @@ class IMAPClient:
                         continue
 
                     # Process attachments
-                    msg = email.message_from_bytes(email_data["raw_email"])
+                    msg = email_data["parsed_msg"]
                     attachments = []
                     for part in msg.walk():
                         content_disposition = str(part.get("Content-Disposition"))
@@ -445,6 +475,8 @@ class IMAPClient:
                         "email_date": email_data["email_date"],
                         "body_text": email_data["body_text"],
                         "body_html": email_data["body_html"],
+                        "has_plain_part": email_data["has_plain_part"],
+                        "list_unsubscribe": email_data["list_unsubscribe"],
                         "uid": email_data["uid"],
                         "attachments": attachments,
                     }
@@ -715,6 +747,9 @@ class IMAPClient:
         if configured:
             return configured
 
+        if self._sent_mailbox:
+            return self._sent_mailbox
+
         if not self.conn:
             return "Sent"
 
@@ -725,64 +760,46 @@ class IMAPClient:
 
             mailboxes: list[tuple[str, str]] = []
             for raw in data:
-                if not raw:
-                    continue
-                try:
-                    line = raw.decode("utf-8", errors="ignore")
-                except Exception:
-                    continue
-
-                attrs = ""
-                name = ""
-                m = re.match(
-                    r'^\((?P<attrs>[^)]*)\)\s+"(?P<delim>[^"]+)"\s+(?P<name>.+)$',
-                    line,
-                )
-                if not m:
-                    m = re.match(
-                        r"^\((?P<attrs>[^)]*)\)\s+(?P<delim>\\S+)\s+(?P<name>.+)$",
-                        line,
-                    )
-                if m:
-                    attrs = (m.group("attrs") or "").strip()
-                    name = (m.group("name") or "").strip()
-                else:
-                    name = line.strip()
-
-                # Strip surrounding quotes from mailbox name.
-                if name.startswith('"') and name.endswith('"') and len(name) >= 2:
-                    name = name[1:-1]
-
-                if name:
-                    mailboxes.append((attrs, name))
+                parsed = self._parse_list_line(raw)
+                if parsed is not None:
+                    mailboxes.append(parsed)
+
+            resolved = self._pick_sent_mailbox(mailboxes)
+            if resolved:
+                self._sent_mailbox = resolved
+                return resolved
+        except Exception as e:
+            logger.debug(f"Failed to resolve sent mailbox via LIST: {e}")
 
-            # 1) Special-use \\Sent
-            for attrs, name in mailboxes:
-                if re.search(r"\\Sent\\b", attrs):
-                    return name
+        return "Sent"
 
-            # 2) Common names (case-insensitive exact match)
-            common_exact = [
-                "Sent",
-                "Sent Messages",
-                "Sent Mail",
-                "Sent Items",
-                "[Gmail]/Sent Mail",
-                "[Google Mail]/Sent Mail",
-            ]
-            for candidate in common_exact:
-                for _attrs, name in mailboxes:
-                    if name.lower() == candidate.lower():
-                        return name
-
-            # 3) Substring heuristics
+    @staticmethod
+    def _pick_sent_mailbox(mailboxes: list[tuple[str, str]]) -> str | None:
+        """Pick the Sent mailbox from parsed LIST (attrs, name) pairs, if any."""
+        # 1) Special-use \\Sent
+        for attrs, name in mailboxes:
+            if _SENT_ATTR_RE.search(attrs):
+                return name
+
+        # 2) Common names (case-insensitive exact match)
+        common_exact = [
+            "Sent",
+            "Sent Messages",
+            "Sent Mail",
+            "Sent Items",
+            "[Gmail]/Sent Mail",
+            "[Google Mail]/Sent Mail",
+        ]
+        for candidate in common_exact:
             for _attrs, name in mailboxes:
-                if "sent" in name.lower():
+                if name.lower() == candidate.lower():
                     return name
-        except Exception as e:
-            logger.debug(f"Failed to resolve sent mailbox via LIST: {e}")
 
-        return "Sent"
+        # 3) Substring heuristics
+        for _attrs, name in mailboxes:
+            if "sent" in name.lower():
+                return name
+        return None
 
     def delete_outgoing_email_by_message_id(self, message_id: str) -> bool:
         """
@@ -806,11 +823,15 @@ class IMAPClient:
         try:
             sent_box = self._resolve_sent_mailbox()
             sent_box = (sent_box or "").strip().strip('"') or "Sent"
-            try:
-                status, _ = self.conn.select(sent_box)
-            except imaplib.IMAP4.error:
-                quoted_sent_box = self._quote_imap_mailbox(sent_box)
-                status, _ = self.conn.select(quoted_sent_box)
+            if self._mailbox_needs_quoting(sent_box):
+                # Quote up front rather than waiting for the server to reject it.
+                status, _ = self.conn.select(self._quote_imap_mailbox(sent_box))
+            else:
+                try:
+                    status, _ = self.conn.select(sent_box)
+                except imaplib.IMAP4.error:
+                    quoted_sent_box = self._quote_imap_mailbox(sent_box)
+                    status, _ = self.conn.select(quoted_sent_box)
             if status != "OK":
                 logger.error(f"Failed to select sent mailbox '{sent_box}' for {self.email_addr}")
                 return False
@@ -1,3 +1,4 @@
+import json
 import os
 import re
 from app.llm import OpenAIClient
@@ -50,6 +51,10 @@ def _sanitize_telegram_limited_html(raw_html: str) -> str:
     if not raw_html:
         return ""
 
+    # Plain text (no tags or entities) needs no DOM; escaping gives the same result.
+    if "<" not in raw_html and "&" not in raw_html:
+        return html_escape(raw_html, quote=False).strip()
+
     # Normalize common line-break tags to newlines before parsing.
     normalized = (
         raw_html.replace("<br />", "\n")
@@ -145,6 +150,20 @@ def format_enhanced_email_summary(summary_data: dict) -> str:
     return "\n".join(parts)
 
 
+def _load_llm_json(json_str: str):
+    """
+    Parse an LLM JSON reply, repairing it only when strict parsing fails.
+
+    Replies are requested with response_format=json_object and are almost always
+    valid, so the C json decoder handles them; json_repair's pure-Python parser
+    is kept as the fallback for malformed output.
+    """
+    try:
+        return json.loads(json_str)
+    except (TypeError, ValueError):
+        return repair_json(json_str=json_str, ensure_ascii=False, return_objects=True)
+
+
 def summarize_email(email_body: str, extra_urls: list[dict] | None = None) -> dict | None:
     """
     Use OpenAI's large language models to summarize an email with enhanced structure.
@@ -228,9 +247,7 @@ Do not hallucinate. If information is missing, use null / [] and keep text conci
         try:
             completion = openai_client.generate_completion(model, messages, True)
             json_str = openai_client.extract_response_text(completion)
-            result = repair_json(
-                json_str=json_str, ensure_ascii=False, return_objects=True
-            )
+            result = _load_llm_json(json_str)
 
             # Handle nested result structure
             if len(result.keys()) == 1:
@@ -160,59 +160,63 @@ class SMTPClient:
 
         total = len(to_list) + len(cc_list) + len(bcc_list)
 
-        # Helper to send one message
-        def _send_one(*, header_to: list[str], header_cc: list[str], rcpt: list[str]) -> None:
-            msg = build_email_message(
-                from_email=from_email,
-                from_name=from_name,
-                to_addrs=header_to,
-                cc_addrs=header_cc,
-                subject=subject,
-                text_body=text_body,
-                html_body=html_body,
-                reply_to=reply_to,
-                in_reply_to=in_reply_to,
-                references=references,
-                message_id=message_id,
-                date=date,
-                attachments=attachments,
-            )
-            self._send_via_smtp(from_email=from_email, recipients=rcpt, message=msg)
-
-        try:
-            if total <= self.max_recipients_per_email:
-                _send_one(
-                    header_to=to_list or [from_email],
-                    header_cc=cc_list,
-                    rcpt=to_list + cc_list + bcc_list,
-                )
-                return True
-
+        # (header To, header Cc, envelope recipients) for each message to deliver.
+        deliveries: list[tuple[list[str], list[str], list[str]]] = []
+        if total <= self.max_recipients_per_email:
+            deliveries.append((to_list or [from_email], cc_list, to_list + cc_list + bcc_list))
+        else:
             # If too many recipients, avoid duplicating delivery to To/Cc.
             if to_list or cc_list:
-                _send_one(header_to=to_list, header_cc=cc_list, rcpt=to_list + cc_list)
+                deliveries.append((to_list, cc_list, to_list + cc_list))
 
             # Send BCC in chunks (To: from_email, no Cc)
             for chunk in _chunk(bcc_list, self.max_recipients_per_email):
-                if not chunk:
-                    continue
-                _send_one(header_to=[from_email], header_cc=[], rcpt=chunk)
+                deliveries.append(([from_email], [], chunk))
 
+        deliveries = [d for d in deliveries if d[2]]
+        if not deliveries:
+            return True
+
+        try:
+            # One session for all chunks: a single connect, handshake and login.
+            with self._connect() as smtp:
+                for header_to, header_cc, rcpt in deliveries:
+                    msg = build_email_message(
+                        from_email=from_email,
+                        from_name=from_name,
+                        to_addrs=header_to,
+                        cc_addrs=header_cc,
+                        subject=subject,
+                        text_body=text_body,
+                        html_body=html_body,
+                        reply_to=reply_to,
+                        in_reply_to=in_reply_to,
+                        references=references,
+                        message_id=message_id,
+                        date=date,
+                        attachments=attachments,
+                    )
+                    self._send_message(smtp, from_email, rcpt, msg)
             return True
         except Exception as e:
             logger.error(f"Failed to send email: {e}")
             return False
 
-    def _send_via_smtp(self, *, from_email: str, recipients: list[str], message: MIMEMultipart) -> None:
-        if not recipients:
-            return
+    @staticmethod
+    def _send_message(
+        smtp: smtplib.SMTP, from_email: str, recipients: list[str], message: MIMEMultipart
+    ) -> None:
+        smtp.sendmail(from_email, recipients, message.as_string())
 
+    def _connect(self) -> smtplib.SMTP:
+        """Open an SMTP session and log in; the caller owns (and closes) it."""
         if self.use_ssl:
             smtp_cls = smtplib.SMTP_SSL
         else:
             smtp_cls = smtplib.SMTP
 
-        with smtp_cls(self.server, self.port, timeout=self.timeout_seconds) as smtp:
+        smtp = smtp_cls(self.server, self.port, timeout=self.timeout_seconds)
+        try:
             smtp.ehlo()
             if not self.use_ssl:
                 try:
@@ -224,5 +228,7 @@ class SMTPClient:
 
             if self.username:
                 smtp.login(self.username, self.password)
-
-            smtp.sendmail(from_email, recipients, message.as_string())
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
@@ -1,12 +1,106 @@
 import email, html, re, html2text
 from email.header import decode_header
+from html.parser import HTMLParser
 from typing import Optional, Tuple
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from app.utils import Logger
 
 logger = Logger().get_logger(__name__)
 
+_NON_CONTENT_SELECTOR = ", ".join(
+    [
+        "blockquote",  # quoted replies in most email clients
+        ".gmail_quote",
+        ".gmail_extra",
+        "#gmail_quote",
+        ".yahoo_quoted",
+        "#divRplyFwdMsg",  # Outlook reply/forward container
+        ".signature",
+        ".footer",
+        ".unsubscribe",
+        "style",
+        "script",
+        "head",
+    ]
+)
+
+# Lines dropped from the cleaned text (unsubscribe, view-in-browser, etc.).
+# Each family is one alternation so a line is scanned once, not once per phrase.
+_BOILERPLATE_RE = re.compile(
+    "|".join(
+        [
+            r"\bunsubscribe\b",
+            r"\bview (this )?email in (your )?browser\b",
+            r"\bmanage (your )?preferences\b",
+            r"\bprivacy policy\b",
+            r"(取消订阅|退订|隐私政策|在浏览器中查看)",
+        ]
+    ),
+    re.IGNORECASE,
+)
+
+# Plain-text markers that start quoted reply history; everything after is cut.
+_REPLY_MARKER_RE = re.compile(
+    "|".join(
+        [
+            r"^on\s.+\swrote:\s*$",
+            r"^-----\s*original message\s*-----\s*$",
+            r"^from:\s",
+            r"^sent:\s",
+            r"^to:\s",
+            r"^subject:\s",
+            r"^(发件人|发送时间|收件人|主题|抄送|密送)[:：]",
+        ]
+    ),
+    re.IGNORECASE,
+)
+
+# Above this size clean_html_content skips the DOM and streams text out with
+# html.parser instead, bounding per-email time and memory on huge newsletters.
+MAX_CLEAN_HTML_CHARS = 2 * 1024 * 1024
+
+# Link text / href fragments that mark an unsubscribe link (matched lower-cased).
+_UNSUBSCRIBE_KEYWORDS = (
+    "unsubscribe",
+    "optout",
+    "opt-out",
+    "manage preferences",
+    "email preferences",
+    "subscription preferences",
+    "退订",
+    "取消订阅",
+    "退訂",
+    "取消訂閱",
+    "解除订阅",
+    "解除訂閱",
+)
+
+# A text/plain part at least this long (and not a stub) is used as-is, so the
+# HTML alternative never has to be parsed.
+MIN_PLAIN_BODY_CHARS = 200
+
+# Plain parts that only point the reader at the HTML version.
+_PLAIN_STUB_RE = re.compile(
+    "|".join(
+        [
+            r"\bview (this|the) (e-?mail|message) (in|on) (your|a|the) (web )?browser\b",
+            r"\bhtml version\b",
+            r"\b(does not|doesn't|cannot|can't) (support|display) html\b",
+            r"\benable html\b",
+            r"(在浏览器中查看|查看网页版|HTML\s*版本)",
+        ]
+    ),
+    re.IGNORECASE,
+)
+
+# Entries of an RFC 2369 List-Unsubscribe header: "<mailto:...>, <https://...>".
+_LIST_UNSUBSCRIBE_ENTRY_RE = re.compile(r"<([^>]+)>")
+
+_BLANK_LINES_RE = re.compile(r"\n\s*\n")
+_INLINE_SPACES_RE = re.compile(r"[ \t]+")
+_EXTRA_NEWLINES_RE = re.compile(r"\n{3,}")
+
 
 def decode_email_address(address: Optional[str]) -> str:
     """
@@ -157,6 +251,42 @@ def get_email_body(msg) -> Tuple[str, str]:
     return body_text, body_html
 
 
+def has_plain_text_part(msg) -> bool:
+    """
+    Whether the message carries its own (non-attachment) text/plain body.
+
+    get_email_body() falls back to an html2text rendering when it does not, so
+    body_text alone cannot tell the two apart.
+    """
+    for part in msg.walk():
+        if part.get_content_type() != "text/plain":
+            continue
+        if "attachment" in str(part.get("Content-Disposition")):
+            continue
+        return True
+    return False
+
+
+def is_sufficient_plain_body(body_text: Optional[str]) -> bool:
+    """
+    Whether a text/plain body is good enough to skip HTML cleaning entirely.
+    """
+    stripped = (body_text or "").strip()
+    if len(stripped) < MIN_PLAIN_BODY_CHARS:
+        return False
+    return not _PLAIN_STUB_RE.search(stripped)
+
+
+def clean_plain_text_content(body_text: str) -> str:
+    """
+    Clean a text/plain body the same way clean_html_content() cleans its text:
+    drop ">" quoted lines and boilerplate, and cut at the first reply marker.
+    """
+    if not body_text:
+        return ""
+    return _postprocess_cleaned_text(body_text.replace("\r\n", "\n"))
+
+
 def remove_spaces_and_urls(text: str) -> str:
     """
     Removes all whitespace characters and URLs from a string.
@@ -176,6 +306,98 @@ def remove_spaces_and_urls(text: str) -> str:
     return text_no_spaces_or_urls
 
 
+def _postprocess_cleaned_text(text_content: str) -> str:
+    """Normalize whitespace and drop boilerplate / quoted-reply lines."""
+    # 清理多余的空白字符
+    # 将多个连续的空白字符（包括换行符）替换为单个空格或换行符
+    text_content = _BLANK_LINES_RE.sub("\n\n", text_content)  # 保留段落分隔
+    text_content = _INLINE_SPACES_RE.sub(" ", text_content)  # 多个空格/制表符替换为单个空格
+    text_content = text_content.replace("\n ", "\n")  # 移除行首空格
+    text_content = text_content.strip()
+
+    # Remove common boilerplate lines (unsubscribe, view-in-browser, etc.)
+    lines = [line.strip() for line in text_content.splitlines()]
+    kept_lines = []
+    for line in lines:
+        if not line:
+            kept_lines.append("")
+            continue
+        if _BOILERPLATE_RE.search(line):
+            continue
+        kept_lines.append(line)
+    text_content = "\n".join(kept_lines)
+    text_content = _EXTRA_NEWLINES_RE.sub("\n\n", text_content).strip()
+
+    # Strip quoted reply history if it is still present as plain text markers.
+    stripped_lines = []
+    for line in text_content.splitlines():
+        if _REPLY_MARKER_RE.search(line.strip()):
+            break
+        # Remove pure quote lines from inline replies (plain-text style)
+        if line.lstrip().startswith(">"):
+            continue
+        stripped_lines.append(line)
+    text_content = "\n".join(stripped_lines)
+    text_content = _EXTRA_NEWLINES_RE.sub("\n\n", text_content).strip()
+
+    return text_content
+
+
+class _StreamingHtmlText(HTMLParser):
+    """Tree-free HTML to text conversion used for oversized email bodies."""
+
+    _SKIP_TAGS = {"script", "style", "head", "blockquote"}
+    _BLOCK_TAGS = {
+        "br", "p", "div", "tr", "li", "table", "section", "article",
+        "h1", "h2", "h3", "h4", "h5", "h6",
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+        self._href: Optional[str] = None
+        self._link_text: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if self._skip_depth:
+            return
+        if tag == "a":
+            self._href = dict(attrs).get("href") or ""
+            self._link_text = []
+        elif tag in self._BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if self._skip_depth:
+            return
+        if tag == "a" and self._href is not None:
+            link_text = "".join(self._link_text).strip()
+            if self._href.startswith(("http://", "https://")):
+                self.parts.append(
+                    f"{link_text} ({self._href})" if link_text else self._href
+                )
+            else:
+                self.parts.append(link_text)
+            self._href = None
+        elif tag in self._BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._href is not None:
+            self._link_text.append(data)
+        else:
+            self.parts.append(data)
+
+
 def clean_html_content(html_content: str) -> str:
     """
     预处理HTML内容，移除样式和脚本，保留链接信息，转换为纯文本
@@ -190,37 +412,22 @@ def clean_html_content(html_content: str) -> str:
         return ""
 
     try:
+        if len(html_content) > MAX_CLEAN_HTML_CHARS:
+            parser = _StreamingHtmlText()
+            parser.feed(html_content)
+            parser.close()
+            return _postprocess_cleaned_text("".join(parser.parts))
+
         # 使用BeautifulSoup解析HTML
         soup = BeautifulSoup(html_content, "html.parser")
 
-        # Remove common non-content areas first (quoted replies / boilerplate)
-        for selector in [
-            "blockquote",  # quoted replies in most email clients
-            ".gmail_quote",
-            ".gmail_extra",
-            "#gmail_quote",
-            ".yahoo_quoted",
-            "#divRplyFwdMsg",  # Outlook reply/forward container
-            ".signature",
-            ".footer",
-            ".unsubscribe",
-        ]:
-            for tag in soup.select(selector):
-                tag.decompose()
-
-        # 移除所有style标签
-        for style in soup.find_all("style"):
-            style.decompose()
-
-        # 移除所有script标签
-        for script in soup.find_all("script"):
-            script.decompose()
-
-        # 移除head内的非内容标签，避免噪音
-        for head in soup.find_all("head"):
-            head.decompose()
+        # Remove non-content areas (quoted replies / boilerplate) and
+        # style/script/head in a single selector pass.
+        for tag in soup.select(_NON_CONTENT_SELECTOR):
+            tag.decompose()
 
-        # Remove hidden elements
+        # Remove hidden elements; strip the style attribute from everything else
+        # in the same pass.
         for tag in soup.find_all(attrs={"hidden": True}):
             tag.decompose()
         for tag in soup.find_all(style=True):
@@ -228,6 +435,7 @@ def clean_html_content(html_content: str) -> str:
             if "display:none" in style_text or "visibility:hidden" in style_text:
                 tag.decompose()
                 continue
+            del tag["style"]
 
         # 处理链接：将<a href="url">链接文本</a>转换为"链接文本 (url)"
         for link in soup.find_all("a", href=True):
@@ -247,65 +455,8 @@ def clean_html_content(html_content: str) -> str:
                 # 对于非http链接，只保留文本
                 link.replace_with(link_text if link_text else "")
 
-        # 移除所有HTML标签的style属性
-        for tag in soup.find_all():
-            if tag.has_attr("style"):
-                del tag["style"]
-
         # 获取纯文本内容
-        text_content = soup.get_text(separator="\n")
-
-        # 清理多余的空白字符
-        # 将多个连续的空白字符（包括换行符）替换为单个空格或换行符
-        text_content = re.sub(r"\n\s*\n", "\n\n", text_content)  # 保留段落分隔
-        text_content = re.sub(
-            r"[ \t]+", " ", text_content
-        )  # 多个空格/制表符替换为单个空格
-        text_content = re.sub(r"\n ", "\n", text_content)  # 移除行首空格
-        text_content = text_content.strip()
-
-        # Remove common boilerplate lines (unsubscribe, view-in-browser, etc.)
-        boilerplate_patterns = [
-            re.compile(r"\bunsubscribe\b", re.IGNORECASE),
-            re.compile(r"\bview (this )?email in (your )?browser\b", re.IGNORECASE),
-            re.compile(r"\bmanage (your )?preferences\b", re.IGNORECASE),
-            re.compile(r"\bprivacy policy\b", re.IGNORECASE),
-            re.compile(r"(取消订阅|退订|隐私政策|在浏览器中查看)", re.IGNORECASE),
-        ]
-        lines = [line.strip() for line in text_content.splitlines()]
-        kept_lines = []
-        for line in lines:
-            if not line:
-                kept_lines.append("")
-                continue
-            if any(p.search(line) for p in boilerplate_patterns):
-                continue
-            kept_lines.append(line)
-        text_content = "\n".join(kept_lines)
-        text_content = re.sub(r"\n{3,}", "\n\n", text_content).strip()
-
-        # Strip quoted reply history if it is still present as plain text markers.
-        reply_markers = [
-            re.compile(r"^on\s.+\swrote:\s*$", re.IGNORECASE),
-            re.compile(r"^-----\s*original message\s*-----\s*$", re.IGNORECASE),
-            re.compile(r"^from:\s", re.IGNORECASE),
-            re.compile(r"^sent:\s", re.IGNORECASE),
-            re.compile(r"^to:\s", re.IGNORECASE),
-            re.compile(r"^subject:\s", re.IGNORECASE),
-            re.compile(r"^(发件人|发送时间|收件人|主题|抄送|密送)[:：]", re.IGNORECASE),
-        ]
-        stripped_lines = []
-        for line in text_content.splitlines():
-            if any(p.search(line.strip()) for p in reply_markers):
-                break
-            # Remove pure quote lines from inline replies (plain-text style)
-            if line.lstrip().startswith(">"):
-                continue
-            stripped_lines.append(line)
-        text_content = "\n".join(stripped_lines)
-        text_content = re.sub(r"\n{3,}", "\n\n", text_content).strip()
-
-        return text_content
+        return _postprocess_cleaned_text(soup.get_text(separator="\n"))
 
     except Exception as e:
         logger.error(f"Error preprocessing HTML content: {e}")
@@ -347,6 +498,39 @@ def clean_html_content(html_content: str) -> str:
             return ""
 
 
+def _unsubscribe_caption(lang: str) -> str:
+    if (lang or "").lower().startswith("zh"):
+        return "退订"
+    return "Unsubscribe"
+
+
+def extract_unsubscribe_from_header(
+    header_value: Optional[str], default_language: str = "en_US", max_urls: int = 1
+) -> list[dict]:
+    """
+    Extract unsubscribe URLs from an RFC 2369 List-Unsubscribe header.
+
+    The header is the canonical source and far cheaper than scanning HTML footers.
+    Only http(s) entries are returned: mailto: cannot back a Telegram URL button.
+    """
+    if not header_value or max_urls <= 0:
+        return []
+
+    caption = _unsubscribe_caption(default_language)
+    results: list[dict] = []
+    for entry in _LIST_UNSUBSCRIBE_ENTRY_RE.findall(str(header_value)):
+        # Folded headers may leave whitespace inside the angle brackets.
+        link = "".join(entry.split())
+        if not link.lower().startswith(("http://", "https://")):
+            continue
+        if any(r["link"] == link for r in results):
+            continue
+        results.append({"caption": caption, "link": link})
+        if len(results) >= max_urls:
+            break
+    return results
+
+
 def extract_unsubscribe_urls(
     html_content: str, default_language: str = "en_US", max_urls: int = 1
 ) -> list[dict]:
@@ -362,36 +546,25 @@ def extract_unsubscribe_urls(
 
     def is_unsubscribe_link(link: str, text: str) -> bool:
         combined = f"{text} {link}".lower()
-        keywords = [
-            "unsubscribe",
-            "optout",
-            "opt-out",
-            "manage preferences",
-            "email preferences",
-            "subscription preferences",
-            "退订",
-            "取消订阅",
-            "退訂",
-            "取消訂閱",
-            "解除订阅",
-            "解除訂閱",
-        ]
-        return any(k in combined for k in keywords)
+        return any(k in combined for k in _UNSUBSCRIBE_KEYWORDS)
 
-    def caption_for_lang(lang: str) -> str:
-        if (lang or "").lower().startswith("zh"):
-            return "退订"
-        return "Unsubscribe"
+    # Cheap pre-check: most emails mention no keyword anywhere, so skip the parse.
+    haystack = html_content.lower()
+    if "&" in haystack:
+        haystack = html.unescape(haystack)
+    if not any(k in haystack for k in _UNSUBSCRIBE_KEYWORDS):
+        return []
 
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
+        # Only <a> elements (and their text) are built into the tree.
+        soup = BeautifulSoup(html_content, "html.parser", parse_only=SoupStrainer("a"))
     except Exception as e:
         logger.error(f"Error parsing HTML for unsubscribe urls: {e}")
         return []
 
     seen = set()
     results: list[dict] = []
-    caption = caption_for_lang(default_language)
+    caption = _unsubscribe_caption(default_language)
 
     for link in soup.find_all("a", href=True):
         href = str(link.get("href", "")).strip()
@@ -66,7 +66,8 @@ class OpenAIClient:
 
             elapsed = time.time() - start_time
             logger.debug(f"llm call completed after {elapsed:.2f}s")
-            logger.debug(f"llm response: {completion}")
+            # Lazy formatting: the completion repr is large and debug is usually off.
+            logger.debug("llm response: %s", completion)
 
             return completion
         except Exception as e:
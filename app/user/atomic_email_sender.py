@@ -69,7 +69,7 @@ def retry_on_telegram_error(max_retries: int = 3, delay: float = 1.0):
     return decorator
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageContent:
     """Data class for storing message content to be sent"""
 
@@ -79,7 +79,7 @@ class MessageContent:
     urls: Optional[List[Dict]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PreparedMessageContent:
     """Data class for storing prepared FormattedText to be sent"""
 
@@ -338,20 +338,22 @@ class AtomicEmailSender:
     async def _prepare_formatted_messages(
         self, messages: List[MessageContent]
     ) -> List["PreparedMessageContent"]:
-        prepared_messages: List[PreparedMessageContent] = []
-        for message in messages:
-            formatted_text = await self._parse_message_text(
-                text=message.text,
-                parse_mode=message.parse_mode,
+        # Parse requests are independent, so run them concurrently; gather keeps
+        # the input order. Parse errors fall back to plain text per message.
+        formatted_texts = await asyncio.gather(
+            *(
+                self._parse_message_text(text=message.text, parse_mode=message.parse_mode)
+                for message in messages
             )
-            prepared_messages.append(
-                PreparedMessageContent(
-                    formatted_text=formatted_text,
-                    send_notification=message.send_notification,
-                    urls=message.urls,
-                )
+        )
+        return [
+            PreparedMessageContent(
+                formatted_text=formatted_text,
+                send_notification=message.send_notification,
+                urls=message.urls,
             )
-        return prepared_messages
+            for message, formatted_text in zip(messages, formatted_texts)
+        ]
 
     async def _parse_message_text(
         self, *, text: str, parse_mode: Optional[str]
@@ -25,9 +25,11 @@ from app.email_utils import (
     format_enhanced_email_summary,
     AccountManager,
     clean_html_content,
+    extract_unsubscribe_from_header,
     extract_unsubscribe_urls,
 )
 from app.email_utils.identity import suggest_identity
+from app.email_utils.text import clean_plain_text_content, is_sufficient_plain_body
 from app.telegram_ui.email_cards import build_incoming_email_card
 from aiotdlib.api import (
     FormattedText,
@@ -48,6 +50,36 @@ from aiotdlib.api import (
 logger = Logger().get_logger(__name__)
 
 
+def ensure_html_utf8_meta(content: str) -> str:
+    """
+    Ensure HTML content declares UTF-8, injecting a meta tag into <head> if needed.
+
+    Args:
+        content: HTML content
+
+    Returns:
+        str: HTML content with a UTF-8 charset declaration
+    """
+    html_content_lower = content.lower()
+    # Check for common charset declarations in meta tags
+    charset_declared = (
+        '<meta charset="utf-8">' in html_content_lower
+        or "charset=utf-8" in html_content_lower
+        or '<meta charset="utf8">' in html_content_lower
+        or "charset=utf8" in html_content_lower
+    )
+    if charset_declared:
+        return content
+
+    # Attempt to inject the meta tag into the <head> section
+    head_match = re.search(r"<head.*?>", content, re.IGNORECASE)
+    if head_match:
+        inject_pos = head_match.end()
+        return content[:inject_pos] + '<meta charset="UTF-8">' + content[inject_pos:]
+    # If no <head> tag, prepend to the whole content
+    return '<meta charset="UTF-8">' + content
+
+
 class EmailTelegramSender:
     """Class for sending emails to Telegram chats"""
 
@@ -279,6 +311,19 @@ class EmailTelegramSender:
             logger.error(f"Error sending formatted text message: {e}")
             return None
 
+    @staticmethod
+    def _render_html_bytes(content: str) -> bytes:
+        """
+        Render HTML content to the UTF-8 bytes written into the preview file
+
+        Args:
+            content: HTML content
+
+        Returns:
+            bytes: UTF-8 encoded HTML with a charset declaration
+        """
+        return ensure_html_utf8_meta(content).encode("utf-8")
+
     async def send_html_as_file(
         self,
         chat_id: int,
@@ -306,32 +351,8 @@ class EmailTelegramSender:
             temp_path = os.path.join(temp_dir, filename)
 
             # Write the content to the file with the specified filename
-            # Ensure HTML content declares UTF-8
-            html_content_lower = content.lower()
-            # Check for common charset declarations in meta tags
-            charset_declared = (
-                '<meta charset="utf-8">' in html_content_lower
-                or "charset=utf-8" in html_content_lower
-                or '<meta charset="utf8">' in html_content_lower
-                or "charset=utf8" in html_content_lower
-            )
-
-            if not charset_declared:
-                # Attempt to inject the meta tag into the <head> section
-                head_match = re.search(r"<head.*?>", content, re.IGNORECASE)
-                if head_match:
-                    inject_pos = head_match.end()
-                    content = (
-                        content[:inject_pos]
-                        + '<meta charset="UTF-8">'
-                        + content[inject_pos:]
-                    )
-                else:
-                    # If no <head> tag, prepend to the whole content
-                    content = '<meta charset="UTF-8">' + content
-
             with open(temp_path, "wb") as f:
-                f.write(content.encode("utf-8"))
+                f.write(self._render_html_bytes(content))
 
             # Send file
             message = await self.bot_client.api.send_message(
@@ -530,14 +551,26 @@ class EmailTelegramSender:
 
     def get_processed_email_content(self, email_data: Dict[str, Any]) -> str:
         """
-        Get processed email content with fallback mechanism from HTML to text
+        Get processed email content, preferring a substantial text/plain part
+
+        A native text/plain part that passes is_sufficient_plain_body() is
+        cleaned and used directly. Otherwise the HTML body is cleaned, with
+        the raw text body as the last fallback.
 
         Args:
             email_data: Email data dictionary
 
         Returns:
-            str: Processed email content, prioritizing HTML over plain text
+            str: Processed email content (plain part, else HTML, else text)
         """
+        # body_text may be an html2text rendering when has_plain_part is False.
+        body_text = email_data.get("body_text", "")
+        if email_data.get("has_plain_part") and is_sufficient_plain_body(body_text):
+            processed_content = clean_plain_text_content(body_text)
+            if processed_content:
+                logger.info("Using text/plain part for email processing")
+                return processed_content
+
         # Prioritize body_html (if exists and non-empty)
         body_html = email_data.get("body_html", "")
         if body_html and body_html.strip():
@@ -551,7 +584,6 @@ class EmailTelegramSender:
                 )
 
         # If body_html doesn't exist, is empty, or processing failed, use body_text as fallback
-        body_text = email_data.get("body_text", "")
         if body_text and body_text.strip():
             logger.info("Using text content for email processing")
             return body_text.strip()
@@ -584,11 +616,15 @@ class EmailTelegramSender:
         attachments_count = len(email_data.get("attachments") or [])
 
         processed_content = self.get_processed_email_content(email_data)
-        unsubscribe_urls: list[dict] = []
+        default_language = os.getenv("DEFAULT_LANGUAGE", "en_US")
+        # Prefer the List-Unsubscribe header; only scan the HTML when it has nothing usable.
+        unsubscribe_urls = extract_unsubscribe_from_header(
+            email_data.get("list_unsubscribe"), default_language=default_language
+        )
         body_html = email_data.get("body_html", "")
-        if body_html and str(body_html).strip():
+        if not unsubscribe_urls and body_html and str(body_html).strip():
             unsubscribe_urls = extract_unsubscribe_urls(
-                body_html, default_language=os.getenv("DEFAULT_LANGUAGE", "en_US")
+                body_html, default_language=default_language
             )
 
         urls: Optional[list[dict]] = None
@@ -7,7 +7,7 @@ from app.email_utils import (
     format_enhanced_email_summary,
     summarize_email,
 )
-from app.email_utils import extract_unsubscribe_urls
+from app.email_utils import extract_unsubscribe_from_header, extract_unsubscribe_urls
 from app.i18n import _
 from app.utils import Logger
 
@@ -86,11 +86,14 @@ async def send_email_to_telegram_legacy(sender: Any, email_data: Dict[str, Any])
         # 6. Email Summary - Use enhanced processing logic, prioritize HTML, fallback to plain text
         processed_content = sender.get_processed_email_content(email_data)
         if processed_content:
-            unsubscribe_urls = []
+            default_language = os.getenv("DEFAULT_LANGUAGE", "en_US")
+            unsubscribe_urls = extract_unsubscribe_from_header(
+                email_data.get("list_unsubscribe"), default_language=default_language
+            )
             body_html = email_data.get("body_html", "")
-            if body_html and body_html.strip():
+            if not unsubscribe_urls and body_html and body_html.strip():
                 unsubscribe_urls = extract_unsubscribe_urls(
-                    body_html, default_language=os.getenv("DEFAULT_LANGUAGE", "en_US")
+                    body_html, default_language=default_language
                 )
 
             summary = summarize_email(processed_content, extra_urls=unsubscribe_urls)
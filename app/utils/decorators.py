@@ -137,8 +137,13 @@ def Singleton(cls):
                     _instances[cls] = cls(*args, **kwargs)
         return _instances[cls]
 
-    def _reset_instance():
+    def _reset_instance(db_path: Optional[str] = None):
         with _lock:
+            # Keep an instance already bound to the requested database path.
+            if db_path is not None and (
+                getattr(_instances.get(cls), "_db_path", None) == db_path
+            ):
+                return
             _instances.pop(cls, None)
 
     # Used by tests to isolate singleton state across test cases.
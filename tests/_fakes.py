@@ -0,0 +1,42 @@
+"""Shared Telegram client fakes for the callback-handler tests."""
+
+from collections import namedtuple
+
+# What a fake send_message returns; handlers only read its id.
+FakeSentMessage = namedtuple("FakeSentMessage", ("id",))
+
+
+class FakeCallbackPayload:
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+class FakeCallbackUpdate:
+    def __init__(self, *, chat_id: int, user_id: int, message_id: int, data: str | bytes):
+        self.chat_id = chat_id
+        self.sender_user_id = user_id
+        self.message_id = message_id
+        # Tests may pass raw callback data taken straight from a button.
+        if not isinstance(data, (bytes, bytearray)):
+            data = data.encode("utf-8")
+        self.payload = FakeCallbackPayload(data=data)
+        self.id = 1
+
+
+class FakeApi:
+    def __init__(self):
+        self.answered = []
+
+    async def answer_callback_query(
+        self, callback_query_id: int, text: str, url: str, cache_time: int
+    ):
+        self.answered.append((callback_query_id, text))
+
+
+class FakeClient:
+    def __init__(self, api: FakeApi | None = None):
+        self.api = api if api is not None else FakeApi()
+        self.edits = []
+
+    async def edit_text(self, **kwargs):
+        self.edits.append(kwargs)
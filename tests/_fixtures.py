@@ -0,0 +1,93 @@
+"""Shared fixtures for test classes that build their DB (and event loop) once."""
+
+import asyncio
+import atexit
+import inspect
+import os
+import shutil
+import tempfile
+import unittest
+
+from app.database import DBManager
+from app.email_utils.account_manager import AccountManager
+
+# One temp root per test run, on tmpfs when available: commits then never hit
+# a disk fsync. Each class gets its own database file inside it.
+_TMP_ROOT = tempfile.mkdtemp(
+    prefix="telegramail-tests-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None
+)
+atexit.register(shutil.rmtree, _TMP_ROOT, ignore_errors=True)
+
+TEST_ACCOUNT = {
+    "email": "a@example.com",
+    "password": "pw",
+    "imap_server": "imap.example.com",
+    "imap_port": 993,
+    "imap_ssl": True,
+    "smtp_server": "smtp.example.com",
+    "smtp_port": 465,
+    "smtp_ssl": True,
+    "alias": "Work",
+    "tg_group_id": 123,
+}
+
+
+def temp_path(filename: str) -> str:
+    """Return a path for ``filename`` inside the per-run temp root."""
+    return os.path.join(_TMP_ROOT, filename)
+
+
+def bootstrap_db(name: str) -> str:
+    """Point the DB singletons at a fresh database file and return its path.
+
+    Test databases are throwaway, so commits skip the fsync as well.
+    """
+    db_path = temp_path(f"{name}.db")
+    os.environ["TELEGRAMAIL_DB_PATH"] = db_path
+    os.environ["TELEGRAMAIL_DB_SYNCHRONOUS"] = "OFF"
+    DBManager.reset_instance(db_path)
+    AccountManager.reset_instance(db_path)
+    return db_path
+
+
+def create_test_account() -> dict:
+    """Add TEST_ACCOUNT (and its default identity) and return the stored row."""
+    account_mgr = AccountManager()
+    if not account_mgr.add_account(dict(TEST_ACCOUNT)):
+        raise RuntimeError("failed to create test account")
+    return account_mgr.get_account(
+        email=TEST_ACCOUNT["email"], smtp_server=TEST_ACCOUNT["smtp_server"]
+    )
+
+
+def teardown_db() -> None:
+    """Drop the env override and the singletons bound to the test database."""
+    os.environ.pop("TELEGRAMAIL_DB_PATH", None)
+    os.environ.pop("TELEGRAMAIL_DB_SYNCHRONOUS", None)
+    DBManager.reset_instance()
+    AccountManager.reset_instance()
+
+
+class SharedLoopTestCase(unittest.TestCase):
+    """Run ``async def`` tests on one event loop per class instead of one per test."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._loop = asyncio.new_event_loop()
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            cls._loop.run_until_complete(cls._loop.shutdown_asyncgens())
+            cls._loop.run_until_complete(cls._loop.shutdown_default_executor())
+            cls._loop.close()
+        finally:
+            super().tearDownClass()
+
+    # Relies on the private unittest.TestCase._callTestMethod hook (the same one
+    # IsolatedAsyncioTestCase overrides); revisit if unittest renames it.
+    def _callTestMethod(self, method):
+        result = method()
+        if inspect.iscoroutine(result):
+            self._loop.run_until_complete(result)
@@ -3,39 +3,10 @@ import tempfile
 import unittest
 from unittest import mock
 
+from tests._fakes import FakeCallbackUpdate, FakeClient
 
-class _FakeCallbackPayload:
-    def __init__(self, data: bytes):
-        self.data = data
-
-
-class _FakeCallbackUpdate:
-    def __init__(self, *, chat_id: int, user_id: int, message_id: int, data: str):
-        self.chat_id = chat_id
-        self.sender_user_id = user_id
-        self.message_id = message_id
-        self.payload = _FakeCallbackPayload(data=data.encode("utf-8"))
-        self.id = 1
-
-
-class _FakeApi:
-    def __init__(self):
-        self.answered = []
-
-    async def answer_callback_query(
-        self, callback_query_id: int, text: str, url: str, cache_time: int
-    ):
-        self.answered.append((callback_query_id, text))
-
-
-class _FakeClient:
-    def __init__(self):
-        self.api = _FakeApi()
-        self.edits = []
-
-    async def edit_text(self, **kwargs):
-        self.edits.append(kwargs)
 
+class _FakeClient(FakeClient):
     async def send_text(self, *args, **kwargs):
         raise AssertionError("send_text should not be used by mailbox picker UI")
 
@@ -84,7 +55,7 @@ class TestAccountMailboxPicker(unittest.IsolatedAsyncioTestCase):
         account_id = str(account["id"])
 
         client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        update = FakeCallbackUpdate(
             chat_id=123, user_id=1, message_id=10, data=f"account_mailboxes_set:{account_id}"
         )
 
@@ -139,7 +110,7 @@ class TestAccountMailboxPicker(unittest.IsolatedAsyncioTestCase):
             # Start picker
             await callback_handler(
                 client,
-                _FakeCallbackUpdate(
+                FakeCallbackUpdate(
                     chat_id=123,
                     user_id=1,
                     message_id=10,
@@ -149,7 +120,7 @@ class TestAccountMailboxPicker(unittest.IsolatedAsyncioTestCase):
             # Toggle Archive (index 1)
             await callback_handler(
                 client,
-                _FakeCallbackUpdate(
+                FakeCallbackUpdate(
                     chat_id=123,
                     user_id=1,
                     message_id=10,
@@ -159,7 +130,7 @@ class TestAccountMailboxPicker(unittest.IsolatedAsyncioTestCase):
             # Save
             await callback_handler(
                 client,
-                _FakeCallbackUpdate(
+                FakeCallbackUpdate(
                     chat_id=123,
                     user_id=1,
                     message_id=10,
@@ -2,38 +2,7 @@ import os
 import tempfile
 import unittest
 
-
-class _FakeCallbackPayload:
-    def __init__(self, data: bytes):
-        self.data = data
-
-
-class _FakeCallbackUpdate:
-    def __init__(self, *, chat_id: int, user_id: int, message_id: int, data: str):
-        self.chat_id = chat_id
-        self.sender_user_id = user_id
-        self.message_id = message_id
-        self.payload = _FakeCallbackPayload(data=data.encode("utf-8"))
-        self.id = 1
-
-
-class _FakeApi:
-    def __init__(self):
-        self.answered = []
-
-    async def answer_callback_query(
-        self, callback_query_id: int, text: str, url: str, cache_time: int
-    ):
-        self.answered.append((callback_query_id, text))
-
-
-class _FakeClient:
-    def __init__(self):
-        self.api = _FakeApi()
-        self.edits = []
-
-    async def edit_text(self, **kwargs):
-        self.edits.append(kwargs)
+from tests._fakes import FakeCallbackUpdate, FakeClient
 
 
 class TestManageAccountCallback(unittest.IsolatedAsyncioTestCase):
@@ -78,10 +47,10 @@ class TestManageAccountCallback(unittest.IsolatedAsyncioTestCase):
         account = account_mgr.get_account(email="a@example.com", smtp_server="smtp.example.com")
         account_id = str(account["id"])
 
-        client = _FakeClient()
+        client = FakeClient()
         await callback_handler(
             client,
-            _FakeCallbackUpdate(
+            FakeCallbackUpdate(
                 chat_id=123,
                 user_id=1,
                 message_id=10,
@@ -139,10 +108,10 @@ class TestManageAccountCallback(unittest.IsolatedAsyncioTestCase):
             )
         )
 
-        client = _FakeClient()
+        client = FakeClient()
         await callback_handler(
             client,
-            _FakeCallbackUpdate(
+            FakeCallbackUpdate(
                 chat_id=123,
                 user_id=1,
                 message_id=10,
@@ -185,7 +154,7 @@ class TestManageAccountCallback(unittest.IsolatedAsyncioTestCase):
         raw, default_id = add_account_signature(raw, name="Default", markdown="Best regards")
         self.assertTrue(account_mgr.update_account(id=account_id, updates={"signature": raw}))
 
-        class _NotModifiedClient(_FakeClient):
+        class _NotModifiedClient(FakeClient):
             async def edit_text(self, **kwargs):
                 self.edits.append(kwargs)
                 raise RuntimeError("[Error 400] MESSAGE_NOT_MODIFIED")
@@ -193,7 +162,7 @@ class TestManageAccountCallback(unittest.IsolatedAsyncioTestCase):
         client = _NotModifiedClient()
         await callback_handler(
             client,
-            _FakeCallbackUpdate(
+            FakeCallbackUpdate(
                 chat_id=123,
                 user_id=1,
                 message_id=10,
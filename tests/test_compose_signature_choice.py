@@ -3,6 +3,8 @@ import re
 import tempfile
 import unittest
 
+from tests._fakes import FakeSentMessage
+
 
 class _FakeSenderId:
     def __init__(self, user_id: int):
@@ -65,7 +67,7 @@ class _FakeApi:
                 "API.send_message() got an unexpected keyword argument 'disable_notification'"
             )
         self.sent_messages.append(kwargs)
-        return type("_Msg", (), {"id": 9001})()
+        return FakeSentMessage(9001)
 
     async def pin_chat_message(self, **kwargs):
         return None
@@ -103,7 +105,7 @@ class _FakeClient:
             )
         self._next_message_id += 1
         self.sent_texts.append({"chat_id": chat_id, "text": text, "kwargs": kwargs})
-        return type("_Msg", (), {"id": self._next_message_id})()
+        return FakeSentMessage(self._next_message_id)
 
     async def edit_text(self, **kwargs):
         self.edits.append(kwargs)
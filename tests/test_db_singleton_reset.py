@@ -0,0 +1,59 @@
+import os
+import unittest
+from unittest import mock
+
+from app.database import DBManager
+from app.email_utils.account_manager import AccountManager
+
+from tests._fixtures import bootstrap_db, teardown_db, temp_path
+
+
+def _main_db_file(db: DBManager) -> str:
+    conn = db._get_connection()
+    try:
+        rows = conn.execute("PRAGMA database_list").fetchall()
+    finally:
+        conn.close()
+    return next(row[2] for row in rows if row[1] == "main")
+
+
+class TestDbSingletonReset(unittest.TestCase):
+    def setUp(self):
+        self.db_path = bootstrap_db(self.id().rsplit(".", 1)[-1])
+
+    def tearDown(self):
+        teardown_db()
+
+    def test_reset_with_same_path_keeps_bound_instances(self):
+        db = DBManager()
+        account_mgr = AccountManager()
+
+        DBManager.reset_instance(self.db_path)
+        AccountManager.reset_instance(self.db_path)
+
+        self.assertIs(DBManager(), db)
+        self.assertIs(AccountManager(), account_mgr)
+
+    def test_reset_with_other_or_no_path_drops_instance(self):
+        db = DBManager()
+
+        other_path = temp_path("other-singleton.db")
+        with mock.patch.dict(os.environ, {"TELEGRAMAIL_DB_PATH": other_path}):
+            DBManager.reset_instance(other_path)
+            other = DBManager()
+            self.assertIsNot(other, db)
+            self.assertEqual(other._db_path, other_path)
+
+            DBManager.reset_instance()
+            self.assertIsNot(DBManager(), other)
+
+    def test_kept_instance_connects_to_its_bound_path(self):
+        db = DBManager()
+
+        # Moving the env override without a reset must not redirect the instance.
+        with mock.patch.dict(
+            os.environ, {"TELEGRAMAIL_DB_PATH": temp_path("elsewhere.db")}
+        ):
+            self.assertEqual(
+                os.path.realpath(_main_db_file(db)), os.path.realpath(self.db_path)
+            )
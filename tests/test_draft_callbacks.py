@@ -2,19 +2,7 @@ import os
 import tempfile
 import unittest
 
-
-class _FakeCallbackPayload:
-    def __init__(self, data: bytes):
-        self.data = data
-
-
-class _FakeCallbackUpdate:
-    def __init__(self, *, chat_id: int, user_id: int, message_id: int, data: str):
-        self.chat_id = chat_id
-        self.sender_user_id = user_id
-        self.message_id = message_id
-        self.payload = _FakeCallbackPayload(data=data.encode("utf-8"))
-        self.id = 1
+from tests._fakes import FakeCallbackUpdate, FakeClient, FakeSentMessage
 
 
 class _FakeApi:
@@ -43,7 +31,7 @@ class _FakeApi:
 
     async def send_message(self, **kwargs):
         self.sent_messages.append(kwargs)
-        return type("Msg", (), {"id": 999})
+        return FakeSentMessage(999)
 
     async def download_file(self, file_id: int, priority: int, offset: int, limit: int, synchronous: bool = False):
         if not self.file_path:
@@ -56,15 +44,6 @@ class _FakeApi:
         return type("_File", (), {"id": file_id, "local": local, "size": 3, "expected_size": 3})()
 
 
-class _FakeClient:
-    def __init__(self, api: _FakeApi | None = None):
-        self.api = api or _FakeApi()
-        self.edits = []
-
-    async def edit_text(self, **kwargs):
-        self.edits.append(kwargs)
-
-
 class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         self._tmp = tempfile.TemporaryDirectory()
@@ -119,8 +98,8 @@ class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
             from_identity_email="a@example.com",
         )
 
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient(_FakeApi())
+        update = FakeCallbackUpdate(
             chat_id=123, user_id=1, message_id=10, data=f"draft:cancel:{draft_id}"
         )
 
@@ -141,8 +120,8 @@ class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
             from_identity_email="a@example.com",
         )
 
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient(_FakeApi())
+        update = FakeCallbackUpdate(
             chat_id=123, user_id=1, message_id=10, data=f"draft:cancel:{draft_id}"
         )
 
@@ -166,8 +145,8 @@ class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
             from_identity_email="a@example.com",
         )
 
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient(_FakeApi())
+        update = FakeCallbackUpdate(
             chat_id=123, user_id=1, message_id=10, data=f"draft:cancel:{draft_id}"
         )
 
@@ -206,8 +185,8 @@ class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
                 called["send"] = kwargs
                 return True
 
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient(_FakeApi())
+        update = FakeCallbackUpdate(
             chat_id=123, user_id=1, message_id=10, data=f"draft:send:{draft_id}"
         )
 
@@ -259,8 +238,8 @@ class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
             def send_email_sync(self, **kwargs):
                 return True
 
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient(_FakeApi())
+        update = FakeCallbackUpdate(
             chat_id=123, user_id=1, message_id=10, data=f"draft:send:{draft_id}"
         )
 
@@ -328,8 +307,8 @@ class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
                 def send_email_sync(self, **kwargs):
                     return True
 
-            client = _FakeClient()
-            update = _FakeCallbackUpdate(
+            client = FakeClient(_FakeApi())
+            update = FakeCallbackUpdate(
                 chat_id=123, user_id=1, message_id=10, data=f"draft:send:{draft_id}"
             )
 
@@ -378,8 +357,8 @@ class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
                 called["send"] = kwargs
                 return True
 
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient(_FakeApi())
+        update = FakeCallbackUpdate(
             chat_id=123, user_id=1, message_id=10, data=f"draft:send:{draft_id}"
         )
 
@@ -431,8 +410,8 @@ class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
                 called["send"] = kwargs
                 return True
 
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient(_FakeApi())
+        update = FakeCallbackUpdate(
             chat_id=123, user_id=1, message_id=10, data=f"draft:send:{draft_id}"
         )
 
@@ -479,8 +458,8 @@ class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
                 called["send"] = kwargs
                 return True
 
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient(_FakeApi())
+        update = FakeCallbackUpdate(
             chat_id=123, user_id=1, message_id=10, data=f"draft:send:{draft_id}"
         )
 
@@ -548,8 +527,8 @@ class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
                 called["send"] = kwargs
                 return True
 
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient(_FakeApi())
+        update = FakeCallbackUpdate(
             chat_id=123, user_id=1, message_id=10, data=f"draft:send:{draft_id}"
         )
 
@@ -603,8 +582,8 @@ class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
                 called["send"] = kwargs
                 return True
 
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient(_FakeApi())
+        update = FakeCallbackUpdate(
             chat_id=123, user_id=1, message_id=10, data=f"draft:send:{draft_id}"
         )
 
@@ -645,8 +624,8 @@ class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
         )
         db.update_draft(draft_id=draft_id, updates={"card_message_id": 77})
 
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient(_FakeApi())
+        update = FakeCallbackUpdate(
             chat_id=123,
             user_id=1,
             message_id=10,
@@ -703,8 +682,8 @@ class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
             def send_email_sync(self, **kwargs):
                 return True
 
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient(_FakeApi())
+        update = FakeCallbackUpdate(
             chat_id=123, user_id=1, message_id=10, data=f"draft:send:{draft_id}"
         )
 
@@ -769,8 +748,8 @@ class TestDraftCallbacks(unittest.IsolatedAsyncioTestCase):
             def send_email_sync(self, **kwargs):
                 return True
 
-        client = _FakeClient(api=_FakeApi(file_path=file_path))
-        update = _FakeCallbackUpdate(
+        client = FakeClient(api=_FakeApi(file_path=file_path))
+        update = FakeCallbackUpdate(
             chat_id=123, user_id=1, message_id=10, data=f"draft:send:{draft_id}"
         )
 
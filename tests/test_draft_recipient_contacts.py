@@ -1,7 +1,36 @@
-import os
+import collections
 import re
-import tempfile
-import unittest
+from unittest import mock
+
+from app.bot.handlers.callback import callback_handler
+from app.bot.handlers.message import message_handler
+from app.database import DBManager
+
+from tests._fakes import FakeCallbackUpdate, FakeSentMessage
+from tests._fixtures import (
+    SharedLoopTestCase,
+    bootstrap_db,
+    create_test_account,
+    teardown_db,
+)
+
+_EMAIL_RE = re.compile(r"[a-z0-9._%+\-]+@[a-z0-9.\-]+\.[a-z]{2,}")
+
+
+def _collect_labels(markup) -> list[str]:
+    rows = getattr(markup, "rows", ())
+    return [button.text for row in rows for button in row if hasattr(button, "text")]
+
+
+def _collect_toggle_buttons(markup) -> list[tuple[object, bytes, str]]:
+    """Return (button, raw callback data, lowercased label) for contact toggle buttons."""
+    toggles = []
+    for row in getattr(markup, "rows", ()):
+        for button in row:
+            data = getattr(getattr(button, "type_", None), "data", b"") or b""
+            if data.startswith(b"draft:rcpt_pick:toggle:"):
+                toggles.append((button, data, (getattr(button, "text", "") or "").lower()))
+    return toggles
 
 
 class _FakeSenderId:
@@ -30,20 +59,6 @@ class _FakeUpdate:
         self.message = message
 
 
-class _FakeCallbackPayload:
-    def __init__(self, data: str):
-        self.data = data.encode("utf-8")
-
-
-class _FakeCallbackUpdate:
-    def __init__(self, *, chat_id: int, user_id: int, message_id: int, data: str):
-        self.chat_id = chat_id
-        self.sender_user_id = user_id
-        self.message_id = message_id
-        self.payload = _FakeCallbackPayload(data)
-        self.id = 1
-
-
 class _FakeClient:
     def __init__(self):
         class _Api:
@@ -52,71 +67,78 @@ class _FakeClient:
 
             async def send_message(self, **kwargs):
                 self._outer.sent_messages.append(kwargs)
-                return type("_Msg", (), {"id": 888})()
+                return FakeSentMessage(888)
 
             async def answer_callback_query(
                 self, callback_query_id: int, text: str, url: str, cache_time: int
             ):
                 return None
 
-        self.edits = []
-        self.sent_messages = []
+        self.edits = collections.deque()
+        self.sent_messages = collections.deque()
         self.api = _Api(self)
 
     async def edit_text(self, **kwargs):
         self.edits.append(kwargs)
 
 
-class TestDraftRecipientContacts(unittest.IsolatedAsyncioTestCase):
+class TestDraftRecipientContacts(SharedLoopTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.db_path = bootstrap_db(cls.__name__)
+        try:
+            cls.account = create_test_account()
+        except Exception:
+            cls.tearDownClass()
+            raise
+        cls._seed_contact_history()
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            teardown_db()
+        finally:
+            super().tearDownClass()
+
     def setUp(self):
-        self._tmp = tempfile.TemporaryDirectory()
-        self.db_path = os.path.join(self._tmp.name, "telegramail-test.db")
-        os.environ["TELEGRAMAIL_DB_PATH"] = self.db_path
-
-        from app.database import DBManager
-        from app.email_utils.account_manager import AccountManager
-
-        DBManager.reset_instance()
-        AccountManager.reset_instance()
-
-        from app.email_utils.account_manager import AccountManager as AM
-
-        self.account_mgr = AM()
-        self.assertTrue(
-            self.account_mgr.add_account(
-                {
-                    "email": "a@example.com",
-                    "password": "pw",
-                    "imap_server": "imap.example.com",
-                    "imap_port": 993,
-                    "imap_ssl": True,
-                    "smtp_server": "smtp.example.com",
-                    "smtp_port": 465,
-                    "smtp_ssl": True,
-                    "alias": "Work",
-                    "tg_group_id": 123,
-                }
-            )
-        )
-        self.account = self.account_mgr.get_account(
-            email="a@example.com", smtp_server="smtp.example.com"
-        )
+        for patcher in (
+            mock.patch("app.bot.handlers.message.validate_admin", lambda _u: True),
+            mock.patch(
+                "app.bot.handlers.message.Conversation.get_instance",
+                lambda *_args, **_kwargs: None,
+            ),
+            mock.patch(
+                "app.bot.handlers.callback.Conversation.get_instance",
+                lambda *_args, **_kwargs: None,
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
 
     def tearDown(self):
+        # DBManager opens a connection per call, so a savepoint can't span a
+        # test; wipe the draft tables and keep the seeded account and history.
+        conn = DBManager()._get_connection()
         try:
-            self._tmp.cleanup()
+            conn.executescript(
+                """
+                DELETE FROM drafts;
+                DELETE FROM draft_attachments;
+                DELETE FROM draft_messages;
+                """
+            )
         finally:
-            os.environ.pop("TELEGRAMAIL_DB_PATH", None)
-
-    def _seed_contact_history(self):
-        from app.database import DBManager
+            conn.close()
 
+    @classmethod
+    def _seed_contact_history(cls):
         db = DBManager()
         conn = db._get_connection()
         cur = conn.cursor()
         rows = [
             (
-                int(self.account["id"]),
+                int(cls.account["id"]),
                 "<msg-1@example.com>",
                 "Alice <alice@example.com>",
                 "a@example.com",
@@ -130,7 +152,7 @@ class TestDraftRecipientContacts(unittest.IsolatedAsyncioTestCase):
                 "INBOX",
             ),
             (
-                int(self.account["id"]),
+                int(cls.account["id"]),
                 "<msg-2@example.com>",
                 "a@example.com",
                 "Bob <bob@example.com>",
@@ -144,110 +166,100 @@ class TestDraftRecipientContacts(unittest.IsolatedAsyncioTestCase):
                 "OUTGOING",
             ),
         ]
-        cur.executemany(
-            """
-            INSERT INTO emails
-              (email_account, message_id, sender, recipient, cc, bcc, subject, email_date,
-               body_text, body_html, uid, mailbox)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            rows,
+        placeholders = ", ".join(["(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"] * len(rows))
+        try:
+            with conn:
+                cur.execute(
+                    f"""
+                    INSERT INTO emails
+                      (email_account, message_id, sender, recipient, cc, bcc, subject, email_date,
+                       body_text, body_html, uid, mailbox)
+                    VALUES {placeholders}
+                    """,
+                    [value for row in rows for value in row],
+                )
+        finally:
+            conn.close()
+
+    async def _open_to_picker(self, client):
+        """Create a draft with an existing To address and open the /to picker on it."""
+        db = DBManager()
+        draft_id = db.create_draft(
+            account_id=self.account["id"],
+            chat_id=123,
+            thread_id=456,
+            draft_type="compose",
+            from_identity_email="a@example.com",
+            updates={"card_message_id": 99, "to_addrs": "old@example.com"},
         )
-        conn.commit()
-        conn.close()
 
-    async def test_to_without_arg_shows_contact_selector(self):
-        from app.database import DBManager
-        from unittest import mock
+        update = _FakeUpdate(_FakeMessage(chat_id=123, thread_id=456, user_id=1, text="/to"))
+        await message_handler(client, update)
+
+        self.assertTrue(client.sent_messages)
+        selector_markup = client.sent_messages[-1].get("reply_markup")
+        self.assertIsNotNone(selector_markup)
+        return draft_id, selector_markup
 
+    async def test_to_without_arg_shows_contact_selector(self):
         db = DBManager()
-        self._seed_contact_history()
-        draft_id = db.create_draft(
+        db.create_draft(
             account_id=self.account["id"],
             chat_id=123,
             thread_id=456,
             draft_type="compose",
             from_identity_email="a@example.com",
+            updates={"card_message_id": 99},
         )
-        db.update_draft(draft_id=draft_id, updates={"card_message_id": 99})
 
         client = _FakeClient()
         update = _FakeUpdate(_FakeMessage(chat_id=123, thread_id=456, user_id=1, text="/to"))
 
-        with mock.patch("app.bot.handlers.message.validate_admin", lambda _u: True), mock.patch(
-            "app.bot.handlers.message.Conversation.get_instance", lambda *_args, **_kwargs: None
-        ):
-            from app.bot.handlers.message import message_handler
-
-            await message_handler(client, update)
+        await message_handler(client, update)
 
         self.assertTrue(client.sent_messages)
         selector_markup = client.sent_messages[-1].get("reply_markup")
         self.assertIsNotNone(selector_markup)
-        labels = [
-            button.text
-            for row in getattr(selector_markup, "rows", [])
-            for button in row
-            if hasattr(button, "text")
-        ]
-        joined = "\n".join(labels).lower()
+        joined = "\n".join(_collect_labels(selector_markup)).lower()
         self.assertIn("alice@example.com", joined)
         self.assertIn("bob@example.com", joined)
         self.assertNotIn("a@example.com", joined)
 
     async def test_to_keyword_filters_contacts(self):
-        from app.database import DBManager
-        from unittest import mock
-
         db = DBManager()
-        self._seed_contact_history()
-        draft_id = db.create_draft(
+        db.create_draft(
             account_id=self.account["id"],
             chat_id=123,
             thread_id=456,
             draft_type="compose",
             from_identity_email="a@example.com",
+            updates={"card_message_id": 99},
         )
-        db.update_draft(draft_id=draft_id, updates={"card_message_id": 99})
 
         client = _FakeClient()
         update = _FakeUpdate(
             _FakeMessage(chat_id=123, thread_id=456, user_id=1, text="/to bob")
         )
 
-        with mock.patch("app.bot.handlers.message.validate_admin", lambda _u: True), mock.patch(
-            "app.bot.handlers.message.Conversation.get_instance", lambda *_args, **_kwargs: None
-        ):
-            from app.bot.handlers.message import message_handler
-
-            await message_handler(client, update)
+        await message_handler(client, update)
 
         self.assertTrue(client.sent_messages)
         selector_markup = client.sent_messages[-1].get("reply_markup")
         self.assertIsNotNone(selector_markup)
-        labels = [
-            button.text
-            for row in getattr(selector_markup, "rows", [])
-            for button in row
-            if hasattr(button, "text")
-        ]
-        joined = "\n".join(labels).lower()
+        joined = "\n".join(_collect_labels(selector_markup)).lower()
         self.assertIn("bob@example.com", joined)
         self.assertNotIn("alice@example.com", joined)
 
     async def test_to_direct_email_still_updates_draft(self):
-        from app.database import DBManager
-        from unittest import mock
-
         db = DBManager()
-        draft_id = db.create_draft(
+        db.create_draft(
             account_id=self.account["id"],
             chat_id=123,
             thread_id=456,
             draft_type="compose",
             from_identity_email="a@example.com",
+            updates={"card_message_id": 99},
         )
-        db.update_draft(draft_id=draft_id, updates={"card_message_id": 99})
 
         client = _FakeClient()
         update = _FakeUpdate(
@@ -259,98 +271,54 @@ class TestDraftRecipientContacts(unittest.IsolatedAsyncioTestCase):
             )
         )
 
-        with mock.patch("app.bot.handlers.message.validate_admin", lambda _u: True), mock.patch(
-            "app.bot.handlers.message.Conversation.get_instance", lambda *_args, **_kwargs: None
-        ):
-            from app.bot.handlers.message import message_handler
-
-            await message_handler(client, update)
+        await message_handler(client, update)
 
         draft = db.get_active_draft(chat_id=123, thread_id=456)
         self.assertEqual(draft["to_addrs"], "direct@example.com")
         self.assertFalse(client.sent_messages)
 
     async def test_callback_select_contact_requires_save_to_apply(self):
-        from app.database import DBManager
-        from unittest import mock
-
         db = DBManager()
-        self._seed_contact_history()
-        draft_id = db.create_draft(
-            account_id=self.account["id"],
-            chat_id=123,
-            thread_id=456,
-            draft_type="compose",
-            from_identity_email="a@example.com",
-        )
-        db.update_draft(
-            draft_id=draft_id,
-            updates={"card_message_id": 99, "to_addrs": "old@example.com"},
-        )
-
         client = _FakeClient()
-        update = _FakeUpdate(_FakeMessage(chat_id=123, thread_id=456, user_id=1, text="/to"))
-
-        with mock.patch("app.bot.handlers.message.validate_admin", lambda _u: True), mock.patch(
-            "app.bot.handlers.message.Conversation.get_instance", lambda *_args, **_kwargs: None
-        ):
-            from app.bot.handlers.message import message_handler
-
-            await message_handler(client, update)
+        draft_id, selector_markup = await self._open_to_picker(client)
 
-        self.assertTrue(client.sent_messages)
-        selector_markup = client.sent_messages[-1].get("reply_markup")
-        self.assertIsNotNone(selector_markup)
+        toggles = _collect_toggle_buttons(selector_markup)
+        self.assertTrue(toggles)
+        toggle_button, callback_data, selected_from_label = toggles[0]
+        # Layout: the selector's first button (unfiltered) is a contact toggle.
         first_button = next(
             (
                 button
-                for row in getattr(selector_markup, "rows", [])
+                for row in getattr(selector_markup, "rows", ())
                 for button in row
                 if hasattr(button, "type_")
             ),
             None,
         )
-        self.assertIsNotNone(first_button)
-        callback_data = (
-            getattr(getattr(first_button, "type_", None), "data", b"") or b""
-        ).decode("utf-8")
-        self.assertTrue(callback_data.startswith("draft:rcpt_pick:toggle:"))
-        selected_from_label = (getattr(first_button, "text", "") or "").lower()
-        email_match = re.search(r"[a-z0-9._%+\-]+@[a-z0-9.\-]+\.[a-z]{2,}", selected_from_label)
+        self.assertIs(first_button, toggle_button)
+        email_match = _EMAIL_RE.search(selected_from_label)
         self.assertIsNotNone(email_match)
         selected_email = email_match.group(0)
 
-        callback_update = _FakeCallbackUpdate(
+        callback_update = FakeCallbackUpdate(
             chat_id=123,
             user_id=1,
             message_id=888,
             data=callback_data,
         )
-        with mock.patch(
-            "app.bot.handlers.callback.Conversation.get_instance",
-            lambda *_args, **_kwargs: None,
-        ):
-            from app.bot.handlers.callback import callback_handler
-
-            await callback_handler(client, callback_update)
+        await callback_handler(client, callback_update)
 
         # Toggle only updates picker UI; draft field is updated on explicit save.
         refreshed = db.get_active_draft(chat_id=123, thread_id=456)
         self.assertEqual((refreshed.get("to_addrs") or "").lower(), "old@example.com")
 
-        save_update = _FakeCallbackUpdate(
+        save_update = FakeCallbackUpdate(
             chat_id=123,
             user_id=1,
             message_id=888,
             data=f"draft:rcpt_pick:save:{draft_id}:to",
         )
-        with mock.patch(
-            "app.bot.handlers.callback.Conversation.get_instance",
-            lambda *_args, **_kwargs: None,
-        ):
-            from app.bot.handlers.callback import callback_handler
-
-            await callback_handler(client, save_update)
+        await callback_handler(client, save_update)
 
         refreshed = db.get_active_draft(chat_id=123, thread_id=456)
         to_addrs = (refreshed.get("to_addrs") or "").lower()
@@ -359,89 +327,38 @@ class TestDraftRecipientContacts(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(any(int(edit.get("message_id") or 0) == 99 for edit in client.edits))
 
     async def test_callback_multi_select_can_add_multiple_contacts(self):
-        from app.database import DBManager
-        from unittest import mock
-
         db = DBManager()
-        self._seed_contact_history()
-        draft_id = db.create_draft(
-            account_id=self.account["id"],
-            chat_id=123,
-            thread_id=456,
-            draft_type="compose",
-            from_identity_email="a@example.com",
-        )
-        db.update_draft(
-            draft_id=draft_id,
-            updates={"card_message_id": 99, "to_addrs": "old@example.com"},
-        )
-
         client = _FakeClient()
-        update = _FakeUpdate(_FakeMessage(chat_id=123, thread_id=456, user_id=1, text="/to"))
-
-        with mock.patch("app.bot.handlers.message.validate_admin", lambda _u: True), mock.patch(
-            "app.bot.handlers.message.Conversation.get_instance", lambda *_args, **_kwargs: None
-        ):
-            from app.bot.handlers.message import message_handler
+        draft_id, selector_markup = await self._open_to_picker(client)
 
-            await message_handler(client, update)
-
-        self.assertTrue(client.sent_messages)
-        selector_markup = client.sent_messages[-1].get("reply_markup")
-        self.assertIsNotNone(selector_markup)
-        contact_buttons = [
-            button
-            for row in getattr(selector_markup, "rows", [])
-            for button in row
-            if hasattr(button, "type_")
-            and "draft:rcpt_pick:toggle:" in (
-                (getattr(getattr(button, "type_", None), "data", b"") or b"").decode(
-                    "utf-8"
-                )
-            )
-        ]
+        contact_buttons = _collect_toggle_buttons(selector_markup)
         self.assertGreaterEqual(len(contact_buttons), 2)
 
         picked_emails = []
-        for button in contact_buttons[:2]:
-            label = (getattr(button, "text", "") or "").lower()
-            match = re.search(r"[a-z0-9._%+\-]+@[a-z0-9.\-]+\.[a-z]{2,}", label)
+        for _button, callback_data, label in contact_buttons[:2]:
+            match = _EMAIL_RE.search(label)
             self.assertIsNotNone(match)
             picked_emails.append(match.group(0))
 
-            callback_update = _FakeCallbackUpdate(
+            callback_update = FakeCallbackUpdate(
                 chat_id=123,
                 user_id=1,
                 message_id=888,
-                data=(
-                    getattr(getattr(button, "type_", None), "data", b"") or b""
-                ).decode("utf-8"),
+                data=callback_data,
             )
-            with mock.patch(
-                "app.bot.handlers.callback.Conversation.get_instance",
-                lambda *_args, **_kwargs: None,
-            ):
-                from app.bot.handlers.callback import callback_handler
-
-                await callback_handler(client, callback_update)
+            await callback_handler(client, callback_update)
 
         # Before save, only existing addresses remain.
         refreshed = db.get_active_draft(chat_id=123, thread_id=456)
         self.assertEqual((refreshed.get("to_addrs") or "").lower(), "old@example.com")
 
-        save_update = _FakeCallbackUpdate(
+        save_update = FakeCallbackUpdate(
             chat_id=123,
             user_id=1,
             message_id=888,
             data=f"draft:rcpt_pick:save:{draft_id}:to",
         )
-        with mock.patch(
-            "app.bot.handlers.callback.Conversation.get_instance",
-            lambda *_args, **_kwargs: None,
-        ):
-            from app.bot.handlers.callback import callback_handler
-
-            await callback_handler(client, save_update)
+        await callback_handler(client, save_update)
 
         refreshed = db.get_active_draft(chat_id=123, thread_id=456)
         to_addrs = (refreshed.get("to_addrs") or "").lower()
@@ -450,46 +367,17 @@ class TestDraftRecipientContacts(unittest.IsolatedAsyncioTestCase):
             self.assertIn(email_addr, to_addrs)
 
     async def test_callback_save_without_change_does_not_edit_draft_card(self):
-        from app.database import DBManager
-        from unittest import mock
-
         db = DBManager()
-        self._seed_contact_history()
-        draft_id = db.create_draft(
-            account_id=self.account["id"],
-            chat_id=123,
-            thread_id=456,
-            draft_type="compose",
-            from_identity_email="a@example.com",
-        )
-        db.update_draft(
-            draft_id=draft_id,
-            updates={"card_message_id": 99, "to_addrs": "old@example.com"},
-        )
-
         client = _FakeClient()
-        update = _FakeUpdate(_FakeMessage(chat_id=123, thread_id=456, user_id=1, text="/to"))
-
-        with mock.patch("app.bot.handlers.message.validate_admin", lambda _u: True), mock.patch(
-            "app.bot.handlers.message.Conversation.get_instance", lambda *_args, **_kwargs: None
-        ):
-            from app.bot.handlers.message import message_handler
+        draft_id, _selector_markup = await self._open_to_picker(client)
 
-            await message_handler(client, update)
-
-        save_update = _FakeCallbackUpdate(
+        save_update = FakeCallbackUpdate(
             chat_id=123,
             user_id=1,
             message_id=888,
             data=f"draft:rcpt_pick:save:{draft_id}:to",
         )
-        with mock.patch(
-            "app.bot.handlers.callback.Conversation.get_instance",
-            lambda *_args, **_kwargs: None,
-        ):
-            from app.bot.handlers.callback import callback_handler
-
-            await callback_handler(client, save_update)
+        await callback_handler(client, save_update)
 
         refreshed = db.get_active_draft(chat_id=123, thread_id=456)
         self.assertEqual((refreshed.get("to_addrs") or "").lower(), "old@example.com")
@@ -1,76 +1,17 @@
-import os
-import tempfile
 import unittest
+import uuid
 
-
-class _FakeCallbackPayload:
-    def __init__(self, data: bytes):
-        self.data = data
-
-
-class _FakeCallbackUpdate:
-    def __init__(self, *, chat_id: int, user_id: int, message_id: int, data: str):
-        self.chat_id = chat_id
-        self.sender_user_id = user_id
-        self.message_id = message_id
-        self.payload = _FakeCallbackPayload(data=data.encode("utf-8"))
-        self.id = 1
-
-
-class _FakeApi:
-    async def answer_callback_query(self, callback_query_id: int, text: str, url: str, cache_time: int):
-        return None
-
-
-class _FakeClient:
-    def __init__(self):
-        self.api = _FakeApi()
-        self.edits = []
-
-    async def edit_text(self, **kwargs):
-        self.edits.append(kwargs)
+from tests._fakes import FakeCallbackUpdate, FakeClient
+from tests._fixtures import bootstrap_db, create_test_account, teardown_db
 
 
 class TestDraftSetFromCallback(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
-        self._tmp = tempfile.TemporaryDirectory()
-        self.db_path = os.path.join(self._tmp.name, "telegramail-test.db")
-        os.environ["TELEGRAMAIL_DB_PATH"] = self.db_path
-
-        from app.database import DBManager
-        from app.email_utils.account_manager import AccountManager
-
-        DBManager.reset_instance()
-        AccountManager.reset_instance()
-
-        from app.email_utils.account_manager import AccountManager as AM
-
-        self.account_mgr = AM()
-        self.assertTrue(
-            self.account_mgr.add_account(
-                {
-                    "email": "a@example.com",
-                    "password": "pw",
-                    "imap_server": "imap.example.com",
-                    "imap_port": 993,
-                    "imap_ssl": True,
-                    "smtp_server": "smtp.example.com",
-                    "smtp_port": 465,
-                    "smtp_ssl": True,
-                    "alias": "Work",
-                    "tg_group_id": 123,
-                }
-            )
-        )
-        self.account = self.account_mgr.get_account(
-            email="a@example.com", smtp_server="smtp.example.com"
-        )
+        self.db_path = bootstrap_db(f"telegramail-test-{uuid.uuid4().hex}")
+        self.account = create_test_account()
 
     def tearDown(self):
-        try:
-            self._tmp.cleanup()
-        finally:
-            os.environ.pop("TELEGRAMAIL_DB_PATH", None)
+        teardown_db()
 
     async def test_callback_sets_from_identity_and_updates_card(self):
         from app.database import DBManager
@@ -93,8 +34,8 @@ class TestDraftSetFromCallback(unittest.IsolatedAsyncioTestCase):
         )
         db.update_draft(draft_id=draft_id, updates={"card_message_id": 99})
 
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient()
+        update = FakeCallbackUpdate(
             chat_id=123,
             user_id=1,
             message_id=77,
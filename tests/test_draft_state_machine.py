@@ -1,48 +1,18 @@
 import os
-import tempfile
 import unittest
+import uuid
+from unittest import mock
+
+from tests._fixtures import bootstrap_db, create_test_account, teardown_db
 
 
 class TestDraftStateMachine(unittest.TestCase):
     def setUp(self):
-        self._tmp = tempfile.TemporaryDirectory()
-        self.db_path = os.path.join(self._tmp.name, "telegramail-test.db")
-        os.environ["TELEGRAMAIL_DB_PATH"] = self.db_path
-
-        from app.database import DBManager
-        from app.email_utils.account_manager import AccountManager
-
-        DBManager.reset_instance()
-        AccountManager.reset_instance()
-
-        from app.email_utils.account_manager import AccountManager as AM
-
-        self.account_mgr = AM()
-        self.assertTrue(
-            self.account_mgr.add_account(
-                {
-                    "email": "a@example.com",
-                    "password": "pw",
-                    "imap_server": "imap.example.com",
-                    "imap_port": 993,
-                    "imap_ssl": True,
-                    "smtp_server": "smtp.example.com",
-                    "smtp_port": 465,
-                    "smtp_ssl": True,
-                    "alias": "Work",
-                    "tg_group_id": 123,
-                }
-            )
-        )
-        self.account = self.account_mgr.get_account(
-            email="a@example.com", smtp_server="smtp.example.com"
-        )
+        self.db_path = bootstrap_db(f"telegramail-test-{uuid.uuid4().hex}")
+        self.account = create_test_account()
 
     def tearDown(self):
-        try:
-            self._tmp.cleanup()
-        finally:
-            os.environ.pop("TELEGRAMAIL_DB_PATH", None)
+        teardown_db()
 
     def test_create_and_get_active_draft(self):
         from app.database import DBManager
@@ -104,3 +74,71 @@ class TestDraftStateMachine(unittest.TestCase):
         self.assertEqual(draft["to_addrs"], "to@example.com")
         self.assertEqual(draft["subject"], "Hello")
 
+    def test_create_draft_applies_initial_updates(self):
+        from app.database import DBManager
+
+        db = DBManager()
+        db.create_draft(
+            account_id=self.account["id"],
+            chat_id=123,
+            thread_id=456,
+            draft_type="compose",
+            from_identity_email="a@example.com",
+            updates={"card_message_id": 99, "to_addrs": "to@example.com", "id": 7},
+        )
+
+        draft = db.get_active_draft(chat_id=123, thread_id=456)
+        self.assertEqual(draft["card_message_id"], 99)
+        self.assertEqual(draft["to_addrs"], "to@example.com")
+        self.assertEqual(draft["status"], "open")
+        self.assertNotEqual(draft["id"], 7)
+
+    def test_active_draft_lookup_uses_index(self):
+        from app.database import DBManager
+
+        conn = DBManager()._get_connection()
+        try:
+            plan = conn.execute(
+                """
+                EXPLAIN QUERY PLAN
+                SELECT * FROM drafts
+                WHERE chat_id = ? AND thread_id = ? AND status = 'open'
+                ORDER BY id DESC
+                LIMIT 1
+                """,
+                (123, 456),
+            ).fetchall()
+        finally:
+            conn.close()
+
+        self.assertIn("idx_drafts_chat_thread_status", " ".join(str(row[-1]) for row in plan))
+
+    def test_connections_use_wal_with_normal_sync(self):
+        from app.database import DBManager
+
+        # bootstrap_db relaxes sync for tests; check the production default.
+        with mock.patch.dict(os.environ):
+            os.environ.pop("TELEGRAMAIL_DB_SYNCHRONOUS", None)
+            DBManager.reset_instance()
+            conn = DBManager()._get_connection()
+        try:
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        finally:
+            conn.close()
+
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(synchronous, 1)  # NORMAL
+
+    def test_db_synchronous_level_can_be_relaxed_for_tests(self):
+        from app.database import DBManager
+
+        with mock.patch.dict(os.environ, {"TELEGRAMAIL_DB_SYNCHRONOUS": "off"}):
+            DBManager.reset_instance()
+            conn = DBManager()._get_connection()
+        try:
+            synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        finally:
+            conn.close()
+
+        self.assertEqual(synchronous, 0)  # OFF
@@ -1,5 +1,10 @@
+import asyncio
 import unittest
 
+from aiotdlib.api import FormattedText
+
+from app.user.email_telegram import AtomicEmailSender, MessageContent
+
 
 class _FakeDBManager:
     def __init__(self, events: list[str], update_ok: bool = True):
@@ -28,8 +33,6 @@ class _FakeEmailSender:
     async def str_to_formatted(self, original: str, parse_mode):
         self._events.append(f"parse:{parse_mode}:{original}")
         # Default behavior is "successfully parsed"
-        from aiotdlib.api import FormattedText
-
         return FormattedText(text=original, entities=[])
 
     async def send_text_message(self, **kwargs):
@@ -55,8 +58,6 @@ class _FakeEmailSender:
 
 class TestAtomicEmailSenderOrdering(unittest.IsolatedAsyncioTestCase):
     async def test_parses_all_messages_before_creating_topic(self):
-        from app.user.email_telegram import AtomicEmailSender, MessageContent
-
         events: list[str] = []
         fake_sender = _FakeEmailSender(events)
         atomic_sender = AtomicEmailSender(fake_sender)
@@ -86,8 +87,6 @@ class TestAtomicEmailSenderOrdering(unittest.IsolatedAsyncioTestCase):
         self.assertLess(first_parse_index, first_create_index)
 
     async def test_parse_failure_falls_back_and_still_sends(self):
-        from app.user.email_telegram import AtomicEmailSender, MessageContent
-
         events: list[str] = []
         fake_sender = _FakeEmailSender(events)
 
@@ -128,3 +127,33 @@ class TestAtomicEmailSenderOrdering(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(fake_sender._sent_formatted_texts), 1)
         self.assertEqual(fake_sender._sent_formatted_texts[0].text, "bad")
 
+    async def test_messages_are_parsed_concurrently_and_sent_in_order(self):
+        events: list[str] = []
+        fake_sender = _FakeEmailSender(events)
+        in_flight = 0
+        peak = 0
+
+        async def _slow_parse(original: str, parse_mode):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return FormattedText(text=original, entities=[])
+
+        fake_sender.str_to_formatted = _slow_parse  # type: ignore[assignment]
+        atomic_sender = AtomicEmailSender(fake_sender)
+
+        ok = await atomic_sender.send_email_atomically(
+            chat_id=123,
+            topic_title="Test topic",
+            messages=[MessageContent(text="one"), MessageContent(text="two")],
+            files=[],
+            attachments=[],
+            email_id=1,
+            account_id=1,
+        )
+
+        self.assertTrue(ok)
+        self.assertEqual(peak, 2)
+        self.assertEqual([t.text for t in fake_sender._sent_formatted_texts], ["one", "two"])
@@ -1,10 +1,15 @@
+from email.message import EmailMessage
 import unittest
+from unittest import mock
+
+from app.email_utils import text
+from app.email_utils.llm import format_enhanced_email_summary
+from app.email_utils.text import clean_html_content, extract_unsubscribe_urls
+from app.user.email_telegram import EmailTelegramSender
 
 
 class TestEmailContentProcessing(unittest.TestCase):
     def test_clean_html_content_removes_quotes_and_boilerplate(self):
-        from app.email_utils.text import clean_html_content
-
         html = """
         <html>
           <head>
@@ -39,8 +44,6 @@ class TestEmailContentProcessing(unittest.TestCase):
         self.assertNotIn("Unsubscribe here", result)
 
     def test_clean_html_content_strips_inline_reply_markers(self):
-        from app.email_utils.text import clean_html_content
-
         html = """
         <html>
           <body>
@@ -59,9 +62,31 @@ class TestEmailContentProcessing(unittest.TestCase):
         self.assertNotIn("On Mon, Bob wrote", result)
         self.assertNotIn("old message content", result)
 
-    def test_extract_unsubscribe_urls_finds_footer_link(self):
-        from app.email_utils.text import extract_unsubscribe_urls
+    def test_clean_html_content_streams_oversized_html_without_dom(self):
+        html = """
+        <html>
+          <head><style>.x{color:red}</style></head>
+          <body>
+            <div>Hi Alice,<br/>Let's meet tomorrow at 3pm.</div>
+            <div>See <a href="https://example.com/path?x=1">the doc</a>.</div>
+            <blockquote>On Mon, Bob wrote:<br/>old message content</blockquote>
+            <div>Unsubscribe here: <a href="https://example.com/u">unsubscribe</a></div>
+          </body>
+        </html>
+        """
+
+        with mock.patch.object(text, "MAX_CLEAN_HTML_CHARS", 10), mock.patch.object(
+            text, "BeautifulSoup", side_effect=AssertionError("DOM used")
+        ):
+            result = text.clean_html_content(html)
 
+        self.assertIn("Let's meet tomorrow at 3pm.", result)
+        self.assertIn("the doc (https://example.com/path?x=1)", result)
+        self.assertNotIn("color:red", result)
+        self.assertNotIn("old message content", result)
+        self.assertNotIn("Unsubscribe here", result)
+
+    def test_extract_unsubscribe_urls_finds_footer_link(self):
         html = """
         <html>
           <body>
@@ -79,9 +104,98 @@ class TestEmailContentProcessing(unittest.TestCase):
         self.assertEqual(urls[0]["caption"], "Unsubscribe")
         self.assertEqual(urls[0]["link"], "https://example.com/unsubscribe?u=1")
 
-    def test_format_enhanced_email_summary_sanitizes_untrusted_fields(self):
-        from app.email_utils.llm import format_enhanced_email_summary
+    def test_extract_unsubscribe_urls_skips_parse_without_keywords(self):
+        html = '<div>Hello</div><a href="https://example.com/read">Read more</a>'
+
+        with mock.patch.object(
+            text, "BeautifulSoup", side_effect=AssertionError("DOM used")
+        ):
+            urls = extract_unsubscribe_urls(html, default_language="en_US")
+
+        self.assertEqual(urls, [])
 
+    def test_extract_unsubscribe_urls_matches_entity_encoded_caption(self):
+        html = '<a href="https://example.com/u?id=1">&#36864;&#35746;</a>'
+
+        urls = extract_unsubscribe_urls(html, default_language="zh_CN")
+
+        self.assertEqual(urls, [{"caption": "退订", "link": "https://example.com/u?id=1"}])
+
+    def test_extract_unsubscribe_from_header_prefers_https_entry(self):
+        header = "<mailto:unsub@example.com?subject=unsubscribe>,\n <https://example.com/\n u?id=1>"
+
+        urls = text.extract_unsubscribe_from_header(header, default_language="zh_CN")
+
+        self.assertEqual(urls, [{"caption": "退订", "link": "https://example.com/u?id=1"}])
+
+    def test_extract_unsubscribe_from_header_ignores_mailto_only(self):
+        self.assertEqual(
+            text.extract_unsubscribe_from_header("<mailto:unsub@example.com>"), []
+        )
+        self.assertEqual(text.extract_unsubscribe_from_header(None), [])
+
+    def test_has_plain_text_part_ignores_html_only_and_attachments(self):
+        html_only = EmailMessage()
+        html_only.set_content("<p>Hi</p>", subtype="html")
+        html_only.add_attachment("notes", filename="notes.txt")
+
+        alternative = EmailMessage()
+        alternative.set_content("Hi")
+        alternative.add_alternative("<p>Hi</p>", subtype="html")
+
+        self.assertFalse(text.has_plain_text_part(html_only))
+        self.assertTrue(text.has_plain_text_part(alternative))
+
+    def test_plain_body_sufficiency_rejects_short_and_stub_parts(self):
+        long_body = "Quarterly report attached. " * 10
+
+        self.assertTrue(text.is_sufficient_plain_body(long_body))
+        self.assertFalse(text.is_sufficient_plain_body("Short note"))
+        self.assertFalse(
+            text.is_sufficient_plain_body(
+                long_body + "\nView this email in your browser: https://example.com"
+            )
+        )
+
+    def test_clean_plain_text_content_drops_quotes_and_boilerplate(self):
+        body = (
+            "Let's meet tomorrow at 3pm.\r\n"
+            "\r\n"
+            "Unsubscribe here: https://example.com/u\r\n"
+            "On Mon, Jan 1, 2024 Bob wrote:\r\n"
+            "> old message content\r\n"
+        )
+
+        result = text.clean_plain_text_content(body)
+
+        self.assertEqual(result, "Let's meet tomorrow at 3pm.")
+
+    def test_processed_content_uses_sufficient_plain_part_before_html(self):
+        # get_processed_email_content() reads no instance state, so skip the
+        # Telegram client setup in __init__.
+        sender = EmailTelegramSender.__new__(EmailTelegramSender)
+        long_body = "Quarterly report attached. " * 10
+        email_data = {
+            "has_plain_part": True,
+            "body_text": long_body,
+            "body_html": "<p>Quarterly report, HTML edition.</p>",
+        }
+
+        with mock.patch(
+            "app.user.email_telegram.clean_html_content", wraps=clean_html_content
+        ) as clean_html:
+            result = sender.get_processed_email_content(email_data)
+            clean_html.assert_not_called()
+            self.assertEqual(result, long_body.strip())
+
+            # A short plain part is not trusted; the HTML path runs instead.
+            result = sender.get_processed_email_content(
+                dict(email_data, body_text="Short note")
+            )
+            clean_html.assert_called_once()
+            self.assertEqual(result, "Quarterly report, HTML edition.")
+
+    def test_format_enhanced_email_summary_sanitizes_untrusted_fields(self):
         summary_data = {
             "summary": 'Hello <a href="https://evil.example">click</a> <b>OK</b> <div>bad</div>',
             "priority": "high",
@@ -105,3 +219,10 @@ class TestEmailContentProcessing(unittest.TestCase):
 
         # Untrusted fields should be HTML-escaped to avoid breaking Telegram HTML parsing.
         self.assertIn("Do &lt;b&gt;this&lt;/b&gt;", formatted)
+
+    def test_format_enhanced_email_summary_escapes_plain_summary(self):
+        formatted = format_enhanced_email_summary(
+            {"summary": "Revenue > forecast", "priority": "low", "category": "other"}
+        )
+
+        self.assertIn("Revenue &gt; forecast", formatted)
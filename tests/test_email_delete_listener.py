@@ -1,8 +1,14 @@
 import datetime
 import os
 import unittest
+import uuid
 from unittest import mock
 
+from app.cron import email_delete_listener as listener
+from app.database import DBManager
+
+from tests._fixtures import bootstrap_db, teardown_db
+
 
 class _FakeTopicInfo:
     def __init__(self, message_thread_id: int):
@@ -31,14 +37,35 @@ class _FakeEventLogResult:
 class _FakeTdApi:
     def __init__(self, events):
         self._events = events
+        self.last_kwargs: dict = {}
 
-    async def get_chat_event_log(self, **_kwargs):
+    async def get_chat_event_log(self, **kwargs):
+        self.last_kwargs = kwargs
         return _FakeEventLogResult(self._events)
 
 
+class _FakeTdClient:
+    def __init__(self, api):
+        self.api = api
+
+
 class _FakeUserClient:
     def __init__(self, api):
-        self.client = mock.Mock(api=api)
+        self.client = _FakeTdClient(api=api)
+
+
+class _FakeIMAPClient:
+    def __init__(self):
+        self.deleted_uids: list[tuple[str, str]] = []
+        self.deleted_message_ids: list[str] = []
+
+    def delete_email_by_uid(self, uid: str, mailbox: str = "INBOX") -> bool:
+        self.deleted_uids.append((uid, mailbox))
+        return True
+
+    def delete_outgoing_email_by_message_id(self, message_id: str) -> bool:
+        self.deleted_message_ids.append(message_id)
+        return True
 
 
 class _FakeDbManager:
@@ -52,8 +79,11 @@ class _FakeDbManager:
     def set_chat_event_cursor(self, chat_id: int, event_id: int) -> None:
         self._cursor_by_chat[chat_id] = event_id
 
-    def upsert_deleted_topic(self, chat_id: int, thread_id: str, event_id: int, deleted_at: int) -> bool:
-        self._pending.add((chat_id, thread_id))
+    def upsert_deleted_topics_batch(self, chat_id: int, topics, last_event_id=None) -> bool:
+        for thread_id, _event_id, _deleted_at in topics:
+            self._pending.add((chat_id, thread_id))
+        if last_event_id is not None:
+            self._cursor_by_chat[chat_id] = last_event_id
         return True
 
     def list_pending_deleted_topics(self, chat_id: int):
@@ -82,10 +112,7 @@ class _FakeAccountManager:
 
 class TestEmailDeleteListener(unittest.IsolatedAsyncioTestCase):
     async def test_passes_request_timeout_to_tdlib(self):
-        from app.cron import email_delete_listener as listener
-
-        api = mock.AsyncMock()
-        api.get_chat_event_log.return_value = _FakeEventLogResult(events=[])
+        api = _FakeTdApi(events=[])
         fake_user_client = _FakeUserClient(api=api)
         fake_db = _FakeDbManager()
 
@@ -98,14 +125,13 @@ class TestEmailDeleteListener(unittest.IsolatedAsyncioTestCase):
         ):
             await listener.check_deleted_topics_for_group(chat_id=777)
 
-        self.assertEqual(api.get_chat_event_log.call_args.kwargs["request_timeout"], 99)
+        self.assertEqual(api.last_kwargs["request_timeout"], 99)
 
     async def test_processes_deleted_topic_even_if_old(self):
         """
         Regression: Previously the listener ignored deletions older than a short time window,
         so topics deleted while the app was down wouldn't delete the server email.
         """
-        from app.cron import email_delete_listener as listener
 
         thread_id = 123
         old_timestamp = int((datetime.datetime.now() - datetime.timedelta(hours=1)).timestamp())
@@ -114,9 +140,7 @@ class TestEmailDeleteListener(unittest.IsolatedAsyncioTestCase):
         fake_user_client = _FakeUserClient(api=api)
         fake_db = _FakeDbManager()
 
-        imap_instance = mock.Mock()
-        imap_instance.delete_email_by_uid.return_value = True
-        imap_instance.delete_outgoing_email_by_message_id.return_value = True
+        imap_instance = _FakeIMAPClient()
 
         with (
             mock.patch("app.user.user_client.UserClient", return_value=fake_user_client),
@@ -126,7 +150,49 @@ class TestEmailDeleteListener(unittest.IsolatedAsyncioTestCase):
         ):
             await listener.check_deleted_topics_for_group(chat_id=777)
 
-        imap_instance.delete_email_by_uid.assert_called_once_with("42", mailbox="INBOX")
-        imap_instance.delete_outgoing_email_by_message_id.assert_called_once_with(
-            "<m1@example.com>"
+        self.assertEqual(imap_instance.deleted_uids, [("42", "INBOX")])
+        self.assertEqual(imap_instance.deleted_message_ids, ["<m1@example.com>"])
+        self.assertEqual(fake_db.get_chat_event_cursor(777), 9001)
+
+
+class TestDeletedTopicsBatchUpsert(unittest.TestCase):
+    def setUp(self):
+        bootstrap_db(f"telegramail-test-{uuid.uuid4().hex}")
+        self.db = DBManager()
+
+    def tearDown(self):
+        teardown_db()
+
+    def test_batch_upsert_records_topics_and_cursor(self):
+        ok = self.db.upsert_deleted_topics_batch(
+            777,
+            [("10", 3, 1000), ("11", 2, 900), ("10", 1, 800)],
+            last_event_id=3,
+        )
+
+        self.assertTrue(ok)
+        pending = self.db.list_pending_deleted_topics(777)
+        self.assertEqual(
+            [(p["thread_id"], p["deleted_at"]) for p in pending],
+            [("10", 800), ("11", 900)],
         )
+        self.assertEqual(self.db.get_chat_event_cursor(777), 3)
+
+    def test_batch_upsert_without_cursor_keeps_existing_cursor(self):
+        self.db.set_chat_event_cursor(777, 5)
+
+        self.assertTrue(self.db.upsert_deleted_topics_batch(777, [("10", 6, 1000)]))
+
+        self.assertEqual(self.db.get_chat_event_cursor(777), 5)
+        self.assertEqual(len(self.db.list_pending_deleted_topics(777)), 1)
+
+    def test_single_topic_upsert_goes_through_batch(self):
+        with mock.patch.object(
+            self.db, "upsert_deleted_topics_batch", wraps=self.db.upsert_deleted_topics_batch
+        ) as batch:
+            self.assertTrue(self.db.upsert_deleted_topic(777, "10", 4, 1000))
+
+        batch.assert_called_once_with(777, [("10", 4, 1000)])
+        pending = self.db.list_pending_deleted_topics(777)
+        self.assertEqual([(p["thread_id"], p["deleted_at"]) for p in pending], [("10", 1000)])
+        self.assertEqual(self.db.get_chat_event_cursor(777), 0)
@@ -1,11 +1,15 @@
 import unittest
 from email.message import EmailMessage
 
+from app.email_utils.identity import (
+    extract_delivered_to_candidates,
+    choose_recommended_from,
+    suggest_identity,
+)
+
 
 class TestEmailIdentityMatching(unittest.TestCase):
     def test_extract_delivered_to_candidates_priority_and_dedup(self):
-        from app.email_utils.identity import extract_delivered_to_candidates
-
         msg = EmailMessage()
         msg["Delivered-To"] = "B+Tag@Example.com"
         msg["X-Original-To"] = "other@example.com"
@@ -21,9 +25,17 @@ class TestEmailIdentityMatching(unittest.TestCase):
         # Dedup should remove duplicates while preserving first occurrence.
         self.assertEqual(candidates.count("b+tag@example.com"), 1)
 
-    def test_choose_recommended_from_prefers_base_for_plus_address(self):
-        from app.email_utils.identity import choose_recommended_from
+    def test_extract_delivered_to_candidates_skips_malformed_header(self):
+        msg = EmailMessage()
+        msg["Delivered-To"] = "(broken"
+        msg["X-Original-To"] = "b+tag@example.com"
 
+        candidates = extract_delivered_to_candidates(msg)
+
+        # A malformed value must not swallow the valid headers after it.
+        self.assertEqual(candidates, ["b+tag@example.com"])
+
+    def test_choose_recommended_from_prefers_base_for_plus_address(self):
         candidates = ["b+tag@example.com"]
         identities = {"b@example.com"}
 
@@ -36,8 +48,6 @@ class TestEmailIdentityMatching(unittest.TestCase):
         self.assertEqual(recommended, "b@example.com")
 
     def test_choose_recommended_from_uses_raw_if_raw_identity_exists(self):
-        from app.email_utils.identity import choose_recommended_from
-
         candidates = ["b+tag@example.com"]
         identities = {"b+tag@example.com"}
 
@@ -50,8 +60,6 @@ class TestEmailIdentityMatching(unittest.TestCase):
         self.assertEqual(recommended, "b+tag@example.com")
 
     def test_choose_recommended_from_falls_back_to_default(self):
-        from app.email_utils.identity import choose_recommended_from
-
         candidates = ["c@example.com"]
         identities = {"b@example.com"}
 
@@ -64,8 +72,6 @@ class TestEmailIdentityMatching(unittest.TestCase):
         self.assertEqual(recommended, "a@example.com")
 
     def test_suggest_identity_returns_base_for_plus_address(self):
-        from app.email_utils.identity import suggest_identity
-
         candidates = ["b+tag@example.com"]
         identities = {"a@example.com"}
 
@@ -74,8 +80,6 @@ class TestEmailIdentityMatching(unittest.TestCase):
         self.assertEqual(suggestion, "b@example.com")
 
     def test_suggest_identity_none_when_already_exists(self):
-        from app.email_utils.identity import suggest_identity
-
         candidates = ["b+tag@example.com"]
         identities = {"b@example.com"}
 
@@ -83,3 +87,13 @@ class TestEmailIdentityMatching(unittest.TestCase):
 
         self.assertIsNone(suggestion)
 
+    def test_suggest_identity_cache_tracks_identity_changes(self):
+        candidates = ["c+tag@example.com"]
+        identities = {"a@example.com"}
+
+        first = suggest_identity(candidates=candidates, identity_emails=identities)
+        identities.add("c@example.com")
+        second = suggest_identity(candidates=candidates, identity_emails=identities)
+
+        self.assertEqual(first, "c@example.com")
+        self.assertIsNone(second)
@@ -1,14 +1,25 @@
+import asyncio
 import unittest
 from unittest import mock
 
+from app.cron import email_ingestion
+
+
+class _FakeIMAPClient:
+    def __init__(self, result: int = 0, error: Exception | None = None):
+        self._result = result
+        self._error = error
+
+    async def fetch_unread_emails(self) -> int:
+        if self._error is not None:
+            raise self._error
+        return self._result
+
 
 class TestEmailIngestion(unittest.IsolatedAsyncioTestCase):
     async def test_fetch_account_emails_returns_count(self):
-        from app.cron import email_ingestion
-
         account = {"id": 1, "email": "a@example.com"}
-        fake_client = mock.Mock()
-        fake_client.fetch_unread_emails = mock.AsyncMock(return_value=2)
+        fake_client = _FakeIMAPClient(result=2)
 
         with mock.patch.object(
             email_ingestion, "IMAPClient", return_value=fake_client
@@ -18,13 +29,8 @@ class TestEmailIngestion(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(count, 2)
 
     async def test_fetch_account_emails_safe_returns_error_tuple(self):
-        from app.cron import email_ingestion
-
         account = {"id": 1, "email": "a@example.com"}
-        fake_client = mock.Mock()
-        fake_client.fetch_unread_emails = mock.AsyncMock(
-            side_effect=RuntimeError("boom")
-        )
+        fake_client = _FakeIMAPClient(error=RuntimeError("boom"))
 
         with mock.patch.object(
             email_ingestion, "IMAPClient", return_value=fake_client
@@ -37,6 +43,52 @@ class TestEmailIngestion(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(count, 0)
         self.assertIn("boom", error)
 
+    async def test_iter_accounts_emails_safe_bounds_concurrency(self):
+        in_flight = 0
+        peak = 0
+
+        async def fake_fetch(account):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return account["email"], 1, ""
+
+        accounts = [{"email": f"{i}@example.com"} for i in range(5)]
+        with mock.patch.object(email_ingestion, "fetch_account_emails_safe", fake_fetch):
+            results = [
+                r
+                async for r in email_ingestion.iter_accounts_emails_safe(
+                    accounts, max_concurrency=2
+                )
+            ]
+
+        self.assertEqual(sorted(r[0] for r in results), sorted(a["email"] for a in accounts))
+        self.assertEqual(peak, 2)
+
+    async def test_iter_accounts_emails_safe_cancels_pending_on_early_exit(self):
+        cancelled: list[str] = []
+
+        async def fake_fetch(account):
+            if account["email"] == "fast@example.com":
+                return account["email"], 1, ""
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.append(account["email"])
+                raise
+            return account["email"], 0, ""
+
+        accounts = [{"email": "fast@example.com"}, {"email": "slow@example.com"}]
+        with mock.patch.object(email_ingestion, "fetch_account_emails_safe", fake_fetch):
+            results = email_ingestion.iter_accounts_emails_safe(accounts, max_concurrency=2)
+            first = await results.__anext__()
+            await results.aclose()
+
+        self.assertEqual(first[0], "fast@example.com")
+        self.assertEqual(cancelled, ["slow@example.com"])
+
 
 if __name__ == "__main__":
     unittest.main()
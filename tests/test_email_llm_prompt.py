@@ -2,16 +2,23 @@ import os
 import unittest
 from unittest import mock
 
+from app.email_utils import llm
+from app.email_utils.llm import summarize_email
+
 
 class TestEmailLlmPrompt(unittest.TestCase):
+    @mock.patch.dict(
+        os.environ,
+        {
+            "ENABLE_LLM_SUMMARY": "1",
+            "OPENAI_BASE_URL": "http://example.invalid",
+            "OPENAI_API_KEY": "sk-test",
+            "OPENAI_EMAIL_SUMMARIZE_MODELS": "gpt-test",
+            "LLM_SUMMARY_THRESHOLD": "0",
+            "DEFAULT_LANGUAGE": "en_US",
+        },
+    )
     def test_prompt_mentions_language_name_for_locale(self):
-        os.environ["ENABLE_LLM_SUMMARY"] = "1"
-        os.environ["OPENAI_BASE_URL"] = "http://example.invalid"
-        os.environ["OPENAI_API_KEY"] = "sk-test"
-        os.environ["OPENAI_EMAIL_SUMMARIZE_MODELS"] = "gpt-test"
-        os.environ["LLM_SUMMARY_THRESHOLD"] = "0"
-        os.environ["DEFAULT_LANGUAGE"] = "en_US"
-
         captured = {}
 
         class _FakeOpenAIClient:
@@ -19,8 +26,6 @@ class TestEmailLlmPrompt(unittest.TestCase):
                 captured["messages"] = messages
                 raise RuntimeError("stop")
 
-        from app.email_utils.llm import summarize_email
-
         with mock.patch("app.email_utils.llm.OpenAIClient", return_value=_FakeOpenAIClient()):
             summarize_email("hello")
 
@@ -28,3 +33,10 @@ class TestEmailLlmPrompt(unittest.TestCase):
         self.assertIn("English", system_content)
         self.assertIn("en_US", system_content)
 
+    def test_llm_json_repair_only_runs_for_malformed_replies(self):
+        with mock.patch.object(llm, "repair_json", wraps=llm.repair_json) as repair:
+            self.assertEqual(llm._load_llm_json('{"summary": "ok"}'), {"summary": "ok"})
+            repair.assert_not_called()
+
+            self.assertEqual(llm._load_llm_json('{"summary": "ok",}'), {"summary": "ok"})
+            repair.assert_called_once()
@@ -1,5 +1,16 @@
 import os
 import unittest
+from unittest import mock
+
+from app.cron import email_receive_config
+from app.cron.email_receive_config import (
+    get_polling_interval_seconds,
+    get_mail_receive_mode,
+    get_imap_idle_timeout_seconds,
+    get_imap_idle_fallback_poll_seconds,
+    get_imap_idle_reconnect_backoff_seconds,
+    get_imap_fetch_concurrency,
+)
 
 
 class TestEmailReceiveConfig(unittest.TestCase):
@@ -10,62 +21,58 @@ class TestEmailReceiveConfig(unittest.TestCase):
             "IMAP_IDLE_TIMEOUT_SECONDS",
             "IMAP_IDLE_FALLBACK_POLL_SECONDS",
             "IMAP_IDLE_RECONNECT_BACKOFF_SECONDS",
+            "IMAP_FETCH_CONCURRENCY",
         ):
             os.environ.pop(key, None)
 
     def test_polling_interval_defaults_to_300_seconds(self):
-        from app.cron.email_receive_config import get_polling_interval_seconds
-
         self.assertEqual(get_polling_interval_seconds(), 300)
 
     def test_polling_interval_invalid_falls_back(self):
-        from app.cron.email_receive_config import get_polling_interval_seconds
-
         os.environ["POLLING_INTERVAL"] = "abc"
         self.assertEqual(get_polling_interval_seconds(), 300)
 
     def test_polling_interval_clamped_to_minimum_10_seconds(self):
-        from app.cron.email_receive_config import get_polling_interval_seconds
-
         os.environ["POLLING_INTERVAL"] = "1"
         self.assertEqual(get_polling_interval_seconds(), 10)
 
     def test_receive_mode_defaults_to_hybrid(self):
-        from app.cron.email_receive_config import get_mail_receive_mode
-
         self.assertEqual(get_mail_receive_mode(), "hybrid")
 
     def test_receive_mode_invalid_falls_back_to_hybrid(self):
-        from app.cron.email_receive_config import get_mail_receive_mode
-
         os.environ["MAIL_RECEIVE_MODE"] = "invalid"
         self.assertEqual(get_mail_receive_mode(), "hybrid")
 
     def test_imap_idle_timeout_defaults_to_1740(self):
-        from app.cron.email_receive_config import get_imap_idle_timeout_seconds
-
         self.assertEqual(get_imap_idle_timeout_seconds(), 1740)
 
     def test_imap_idle_timeout_invalid_falls_back(self):
-        from app.cron.email_receive_config import get_imap_idle_timeout_seconds
-
         os.environ["IMAP_IDLE_TIMEOUT_SECONDS"] = "bad"
         self.assertEqual(get_imap_idle_timeout_seconds(), 1740)
 
     def test_fallback_poll_seconds_clamped_to_minimum_1(self):
-        from app.cron.email_receive_config import get_imap_idle_fallback_poll_seconds
-
         os.environ["IMAP_IDLE_FALLBACK_POLL_SECONDS"] = "0"
         self.assertEqual(get_imap_idle_fallback_poll_seconds(), 1)
 
     def test_reconnect_backoff_seconds_clamped_to_minimum_1(self):
-        from app.cron.email_receive_config import (
-            get_imap_idle_reconnect_backoff_seconds,
-        )
-
         os.environ["IMAP_IDLE_RECONNECT_BACKOFF_SECONDS"] = "-1"
         self.assertEqual(get_imap_idle_reconnect_backoff_seconds(), 1)
 
+    def test_imap_fetch_concurrency_defaults_to_8_and_clamps_to_1(self):
+        self.assertEqual(get_imap_fetch_concurrency(), 8)
+        os.environ["IMAP_FETCH_CONCURRENCY"] = "0"
+        self.assertEqual(get_imap_fetch_concurrency(), 1)
+
+    def test_getters_reparse_only_when_env_value_changes(self):
+        os.environ["IMAP_IDLE_TIMEOUT_SECONDS"] = "abc"
+        with mock.patch.object(email_receive_config, "logger") as fake_logger:
+            self.assertEqual(get_imap_idle_timeout_seconds(), 1740)
+            self.assertEqual(get_imap_idle_timeout_seconds(), 1740)
+            self.assertEqual(fake_logger.warning.call_count, 1)
+
+            os.environ["IMAP_IDLE_TIMEOUT_SECONDS"] = "60"
+            self.assertEqual(get_imap_idle_timeout_seconds(), 60)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,8 @@
 import asyncio
 import unittest
 
+from app.cron.email_receive_runtime import EmailReceiveRuntime
+
 
 class _FakeIdleManager:
     def __init__(self):
@@ -16,8 +18,6 @@ class _FakeIdleManager:
 
 class TestEmailReceiveRuntime(unittest.IsolatedAsyncioTestCase):
     async def test_polling_mode_starts_only_polling(self):
-        from app.cron.email_receive_runtime import EmailReceiveRuntime
-
         idle_manager = _FakeIdleManager()
         started_intervals = []
 
@@ -43,8 +43,6 @@ class TestEmailReceiveRuntime(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(idle_manager.stop_calls, 0)
 
     async def test_idle_mode_starts_only_idle_manager(self):
-        from app.cron.email_receive_runtime import EmailReceiveRuntime
-
         idle_manager = _FakeIdleManager()
         started_intervals = []
 
@@ -67,8 +65,6 @@ class TestEmailReceiveRuntime(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(idle_manager.stop_calls, 1)
 
     async def test_hybrid_mode_starts_both(self):
-        from app.cron.email_receive_runtime import EmailReceiveRuntime
-
         idle_manager = _FakeIdleManager()
         started_intervals = []
 
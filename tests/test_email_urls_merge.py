@@ -1,70 +1,90 @@
+import json
 import os
 import unittest
 from unittest import mock
 
+from app.email_utils import llm
+from app.email_utils.llm import summarize_email
+
+
+_BASE_LLM_RESULT = {
+    "summary": "Hello",
+    "priority": "medium",
+    "action_required": False,
+    "action_items": [],
+    "deadline": None,
+    "key_contacts": [],
+    "category": "other",
+}
+# LLM replies serialized once at import; each test just selects one.
+_MINIMAL_LLM_JSON = json.dumps({**_BASE_LLM_RESULT, "urls": []})
+_FULL_LLM_JSON = json.dumps(
+    {
+        **_BASE_LLM_RESULT,
+        "urls": [
+            {"caption": c, "link": f"https://example.com/{c.lower()}"}
+            for c in "ABCDE"
+        ],
+    }
+)
+
+
+class _FakeOpenAIClient:
+    def __init__(self):
+        self.response_text = _MINIMAL_LLM_JSON
+
+    def generate_completion(self, model, messages, output_json=False):
+        return object()
+
+    def extract_response_text(self, completion):
+        return self.response_text
+
 
 class TestEmailUrlsMerge(unittest.TestCase):
-    def test_summarize_email_merges_extra_unsubscribe_urls(self):
-        os.environ["ENABLE_LLM_SUMMARY"] = "1"
-        os.environ["OPENAI_BASE_URL"] = "http://example.invalid"
-        os.environ["OPENAI_API_KEY"] = "sk-test"
-        os.environ["OPENAI_EMAIL_SUMMARIZE_MODELS"] = "gpt-test"
-        os.environ["LLM_SUMMARY_THRESHOLD"] = "0"
-        os.environ["DEFAULT_LANGUAGE"] = "en_US"
-
-        class _FakeOpenAIClient:
-            def generate_completion(self, model, messages, output_json=False):
-                return object()
-
-            def extract_response_text(self, completion):
-                return (
-                    '{"summary":"Hello","priority":"medium","action_required":false,'
-                    '"action_items":[],"deadline":null,"key_contacts":[],'
-                    '"category":"other","urls":[]}'
-                )
-
-        from app.email_utils.llm import summarize_email
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._env_patcher = mock.patch.dict(
+            os.environ,
+            {
+                "ENABLE_LLM_SUMMARY": "1",
+                "OPENAI_BASE_URL": "http://example.invalid",
+                "OPENAI_API_KEY": "sk-test",
+                "OPENAI_EMAIL_SUMMARIZE_MODELS": "gpt-test",
+                "LLM_SUMMARY_THRESHOLD": "0",
+                "DEFAULT_LANGUAGE": "en_US",
+            },
+        )
+        cls._env_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            cls._env_patcher.stop()
+        finally:
+            super().tearDownClass()
 
+    def setUp(self):
+        self.fake_client = _FakeOpenAIClient()
+        patcher = mock.patch.object(llm, "OpenAIClient", return_value=self.fake_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_summarize_email_merges_extra_unsubscribe_urls(self):
+        self.fake_client.response_text = _MINIMAL_LLM_JSON
         extra = [{"caption": "Unsubscribe", "link": "https://example.com/unsubscribe"}]
 
-        with mock.patch("app.email_utils.llm.OpenAIClient", return_value=_FakeOpenAIClient()):
-            result = summarize_email("hello", extra_urls=extra)
+        result = summarize_email("hello", extra_urls=extra)
 
         self.assertIsNotNone(result)
         self.assertIn("urls", result)
         self.assertEqual(result["urls"][0]["link"], "https://example.com/unsubscribe")
 
     def test_summarize_email_keeps_extra_urls_when_llm_already_full(self):
-        os.environ["ENABLE_LLM_SUMMARY"] = "1"
-        os.environ["OPENAI_BASE_URL"] = "http://example.invalid"
-        os.environ["OPENAI_API_KEY"] = "sk-test"
-        os.environ["OPENAI_EMAIL_SUMMARIZE_MODELS"] = "gpt-test"
-        os.environ["LLM_SUMMARY_THRESHOLD"] = "0"
-        os.environ["DEFAULT_LANGUAGE"] = "en_US"
-
-        class _FakeOpenAIClient:
-            def generate_completion(self, model, messages, output_json=False):
-                return object()
-
-            def extract_response_text(self, completion):
-                return (
-                    '{"summary":"Hello","priority":"medium","action_required":false,'
-                    '"action_items":[],"deadline":null,"key_contacts":[],'
-                    '"category":"other","urls":['
-                    '{"caption":"A","link":"https://example.com/a"},'
-                    '{"caption":"B","link":"https://example.com/b"},'
-                    '{"caption":"C","link":"https://example.com/c"},'
-                    '{"caption":"D","link":"https://example.com/d"},'
-                    '{"caption":"E","link":"https://example.com/e"}'
-                    ']}'
-                )
-
-        from app.email_utils.llm import summarize_email
-
+        self.fake_client.response_text = _FULL_LLM_JSON
         extra = [{"caption": "Unsubscribe", "link": "https://example.com/unsubscribe"}]
 
-        with mock.patch("app.email_utils.llm.OpenAIClient", return_value=_FakeOpenAIClient()):
-            result = summarize_email("hello", extra_urls=extra)
+        result = summarize_email("hello", extra_urls=extra)
 
         urls = result.get("urls", [])
         self.assertLessEqual(len(urls), 5)
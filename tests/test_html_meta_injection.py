@@ -1,35 +1,27 @@
 import unittest
-from types import SimpleNamespace
 
+from app.user.email_telegram import EmailTelegramSender, ensure_html_utf8_meta
 
-class _FakeApi:
-    def __init__(self):
-        self.captured_html: str | None = None
 
-    async def send_message(self, **kwargs):
-        input_message_content = kwargs.get("input_message_content")
-        document = getattr(input_message_content, "document", None)
-        path = getattr(document, "path", None)
-        if path:
-            with open(path, "rb") as f:
-                self.captured_html = f.read().decode("utf-8")
-        return object()
+class TestHtmlMetaInjection(unittest.TestCase):
+    def test_ensure_html_utf8_meta_does_not_write_literal_backslash_n(self):
+        html = ensure_html_utf8_meta("<html><body><h2>标题</h2></body></html>")
 
+        self.assertNotIn("\\n<html", html)
+        self.assertTrue(html.startswith('<meta charset="UTF-8"><html>'))
 
-class TestHtmlMetaInjection(unittest.IsolatedAsyncioTestCase):
-    async def test_send_html_as_file_does_not_write_literal_backslash_n(self):
-        from app.user.email_telegram import EmailTelegramSender
+    def test_ensure_html_utf8_meta_injects_into_head_once(self):
+        html = ensure_html_utf8_meta("<html><head><title>t</title></head></html>")
 
-        fake_api = _FakeApi()
-        fake_self = SimpleNamespace(bot_client=SimpleNamespace(api=fake_api))
-
-        await EmailTelegramSender.send_html_as_file(
-            fake_self,
-            chat_id=1,
-            thread_id=1,
-            content="<html><body><h2>标题</h2></body></html>",
+        self.assertEqual(
+            html, '<html><head><meta charset="UTF-8"><title>t</title></head></html>'
         )
+        self.assertEqual(ensure_html_utf8_meta(html), html)
 
-        self.assertIsNotNone(fake_api.captured_html)
-        self.assertNotIn("\\n<html", fake_api.captured_html)
+    def test_render_html_bytes_encodes_utf8_with_meta(self):
+        data = EmailTelegramSender._render_html_bytes("<html><body>标题</body></html>")
 
+        self.assertNotIn(b"\\n<html", data)
+        self.assertEqual(
+            data, '<meta charset="UTF-8"><html><body>标题</body></html>'.encode("utf-8")
+        )
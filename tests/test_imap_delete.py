@@ -1,48 +1,70 @@
+import imaplib
 import unittest
 from unittest import mock
-import imaplib
+
+from app.email_utils.imap_client import IMAPClient
 
 
 class _FakeConn:
     def __init__(self):
         self.calls = []
+        # (verb,) / (verb, first arg) keys for O(1) "was this called" checks.
+        self.call_keys: set[tuple] = set()
+        self.header_searches = 0
+        self._uid_ops = {
+            "STORE": self._uid_store,
+            "EXPUNGE": self._uid_expunge,
+            "SEARCH": self._uid_search,
+        }
+
+    def _record(self, *call):
+        self.calls.append(call)
+        self.call_keys.add(call[:1])
+        self.call_keys.add(call[:2])
 
     def list(self):
-        self.calls.append(("list",))
+        self._record("list")
         return "OK", [b'(\\HasNoChildren \\Sent) "/" "Sent"']
 
     def select(self, mailbox):
-        self.calls.append(("select", mailbox))
+        self._record("select", mailbox)
         return "OK", [b""]
 
     def uid(self, command, *args):
-        self.calls.append(("uid", command, *args))
-        if command == "STORE":
-            return "OK", [b"FLAGS (\\Deleted)"]
-        if command == "EXPUNGE":
-            return "OK", [b"1 EXPUNGE"]
-        if command == "SEARCH":
-            # Message exists
-            if len(args) >= 4 and str(args[1]).upper() == "HEADER":
-                return "OK", [b"999"]
-            return "OK", [b"123"]
+        self._record("uid", command, *args)
+        return self._uid_ops.get(command, self._uid_default)(*args)
+
+    def _uid_store(self, *args):
+        return "OK", [b"FLAGS (\\Deleted)"]
+
+    def _uid_expunge(self, *args):
+        return "OK", [b"1 EXPUNGE"]
+
+    def _uid_search(self, *args):
+        # Message exists
+        if len(args) >= 4 and str(args[1]).upper() == "HEADER":
+            self.header_searches += 1
+            return "OK", [b"999"]
+        return "OK", [b"123"]
+
+    def _uid_default(self, *args):
         return "OK", [b""]
 
     def expunge(self):
-        self.calls.append(("expunge",))
+        self._record("expunge")
         return "OK", [b"1 EXPUNGE"]
 
     def logout(self):
-        self.calls.append(("logout",))
+        self._record("logout")
 
 
 class _StrictSentMailboxConn(_FakeConn):
     def list(self):
-        self.calls.append(("list",))
+        self._record("list")
         return "OK", [b'(\\HasNoChildren \\Sent) "/" "[Gmail]/Sent Mail"']
 
     def select(self, mailbox):
-        self.calls.append(("select", mailbox))
+        self._record("select", mailbox)
         if mailbox == "[Gmail]/Sent Mail":
             raise imaplib.IMAP4.error("SELECT command error: BAD [b'Could not parse command']")
         if mailbox == '"[Gmail]/Sent Mail"':
@@ -51,93 +73,85 @@ class _StrictSentMailboxConn(_FakeConn):
 
 
 class TestImapDelete(unittest.TestCase):
-    def test_delete_email_by_uid_expunges(self):
-        from app.email_utils.imap_client import IMAPClient
-
+    def _make_client(self, fake_conn):
         fake_db = mock.Mock()
         fake_db.delete_email_by_uid.return_value = True
 
         with mock.patch("app.email_utils.imap_client.DBManager", return_value=fake_db):
             client = IMAPClient(account={"id": 1, "email": "test@example.com"})
-
-        fake_conn = _FakeConn()
         client.conn = fake_conn
+        return client, fake_db
 
-        ok = client.delete_email_by_uid("42")
-        self.assertTrue(ok)
-
-        # Defaults to INBOX.
-        self.assertIn(("select", "INBOX"), fake_conn.calls)
-
-        # Must expunge (either UID EXPUNGE or EXPUNGE fallback).
-        uid_cmds = [c for c in fake_conn.calls if c[:2] == ("uid", "EXPUNGE")]
-        expunge_calls = [c for c in fake_conn.calls if c[0] == "expunge"]
-        self.assertTrue(uid_cmds or expunge_calls)
-
-    def test_delete_email_by_uid_selects_requested_mailbox(self):
-        from app.email_utils.imap_client import IMAPClient
-
-        fake_db = mock.Mock()
-        fake_db.delete_email_by_uid.return_value = True
-
-        with mock.patch("app.email_utils.imap_client.DBManager", return_value=fake_db):
-            client = IMAPClient(account={"id": 1, "email": "test@example.com"})
+    def test_delete_email_by_uid_selects_mailbox_and_expunges(self):
+        # (mailbox kwarg, expected SELECT argument); None means "use the default".
+        cases = [(None, "INBOX"), ("Archive", "Archive")]
+        for mailbox, expected_select in cases:
+            with self.subTest(mailbox=mailbox):
+                fake_conn = _FakeConn()
+                client, _fake_db = self._make_client(fake_conn)
 
-        fake_conn = _FakeConn()
-        client.conn = fake_conn
+                kwargs = {} if mailbox is None else {"mailbox": mailbox}
+                ok = client.delete_email_by_uid("42", **kwargs)
+                self.assertTrue(ok)
 
-        ok = client.delete_email_by_uid("42", mailbox="Archive")
-        self.assertTrue(ok)
+                self.assertIn(("select", expected_select), fake_conn.call_keys)
 
-        self.assertIn(("select", "Archive"), fake_conn.calls)
+                # Must expunge (either UID EXPUNGE or EXPUNGE fallback).
+                self.assertTrue(
+                    ("uid", "EXPUNGE") in fake_conn.call_keys
+                    or ("expunge",) in fake_conn.call_keys
+                )
 
     def test_delete_outgoing_email_by_message_id_searches_sent_and_expunges(self):
-        from app.email_utils.imap_client import IMAPClient
-
-        fake_db = mock.Mock()
-        fake_db.delete_email_by_uid.return_value = True
-
-        with mock.patch("app.email_utils.imap_client.DBManager", return_value=fake_db):
-            client = IMAPClient(account={"id": 1, "email": "test@example.com"})
-
         fake_conn = _FakeConn()
-        client.conn = fake_conn
+        client, fake_db = self._make_client(fake_conn)
 
         ok = client.delete_outgoing_email_by_message_id("<m1@example.com>")
         self.assertTrue(ok)
 
         # Select the Sent mailbox (resolved via LIST \\Sent).
-        self.assertIn(("select", "Sent"), fake_conn.calls)
+        self.assertIn(("select", "Sent"), fake_conn.call_keys)
 
         # Search by Message-ID header in Sent.
-        header_search = [
-            c
-            for c in fake_conn.calls
-            if c[:2] == ("uid", "SEARCH") and "HEADER" in [str(x).upper() for x in c]
-        ]
-        self.assertTrue(header_search)
+        self.assertGreater(fake_conn.header_searches, 0)
 
         # Must expunge (either UID EXPUNGE or EXPUNGE fallback).
-        uid_cmds = [c for c in fake_conn.calls if c[:2] == ("uid", "EXPUNGE")]
-        expunge_calls = [c for c in fake_conn.calls if c[0] == "expunge"]
-        self.assertTrue(uid_cmds or expunge_calls)
+        self.assertTrue(
+            ("uid", "EXPUNGE") in fake_conn.call_keys or ("expunge",) in fake_conn.call_keys
+        )
 
         fake_db.delete_email_by_uid.assert_called_once_with(
             {"id": 1, "email": "test@example.com"}, "outgoing:<m1@example.com>"
         )
 
     def test_delete_outgoing_email_by_message_id_quotes_sent_mailbox_with_spaces(self):
-        from app.email_utils.imap_client import IMAPClient
-
-        fake_db = mock.Mock()
-        fake_db.delete_email_by_uid.return_value = True
-
-        with mock.patch("app.email_utils.imap_client.DBManager", return_value=fake_db):
-            client = IMAPClient(account={"id": 1, "email": "test@example.com"})
-
         fake_conn = _StrictSentMailboxConn()
-        client.conn = fake_conn
+        client, _fake_db = self._make_client(fake_conn)
 
         ok = client.delete_outgoing_email_by_message_id("<m2@example.com>")
         self.assertTrue(ok)
-        self.assertIn(("select", '"[Gmail]/Sent Mail"'), fake_conn.calls)
+        self.assertIn(("select", '"[Gmail]/Sent Mail"'), fake_conn.call_keys)
+        # Quoted up front: the unquoted SELECT that the server rejects is never sent.
+        self.assertNotIn(("select", "[Gmail]/Sent Mail"), fake_conn.call_keys)
+
+    def test_sent_mailbox_is_resolved_once_per_client(self):
+        fake_conn = _StrictSentMailboxConn()
+        client, _fake_db = self._make_client(fake_conn)
+
+        def _reconnect():
+            client.conn = fake_conn
+            return True
+
+        with mock.patch.object(client, "connect", side_effect=_reconnect):
+            self.assertTrue(client.delete_outgoing_email_by_message_id("<m3@example.com>"))
+            self.assertTrue(client.delete_outgoing_email_by_message_id("<m4@example.com>"))
+
+        self.assertEqual(fake_conn.calls.count(("list",)), 1)
+        self.assertEqual(fake_conn.calls.count(("select", '"[Gmail]/Sent Mail"')), 2)
+
+    def test_mailbox_needs_quoting(self):
+        self.assertTrue(IMAPClient._mailbox_needs_quoting("[Gmail]/Sent Mail"))
+        self.assertTrue(IMAPClient._mailbox_needs_quoting('Odd"Name'))
+        self.assertTrue(IMAPClient._mailbox_needs_quoting(""))
+        self.assertFalse(IMAPClient._mailbox_needs_quoting("Sent"))
+        self.assertFalse(IMAPClient._mailbox_needs_quoting("[Gmail]/Sent"))
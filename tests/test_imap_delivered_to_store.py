@@ -1,50 +1,44 @@
 import json
-import os
-import tempfile
+import sqlite3
 import unittest
 
+from app.database import DBManager
+from app.email_utils.imap_client import IMAPClient
 
-class TestImapDeliveredToStore(unittest.TestCase):
-    def setUp(self):
-        self._tmp = tempfile.TemporaryDirectory()
-        self.db_path = os.path.join(self._tmp.name, "telegramail-test.db")
-        os.environ["TELEGRAMAIL_DB_PATH"] = self.db_path
+from tests._fixtures import bootstrap_db, create_test_account, teardown_db
 
-        from app.database import DBManager
-        from app.email_utils.account_manager import AccountManager
 
-        DBManager.reset_instance()
-        AccountManager.reset_instance()
+class TestImapDeliveredToStore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Build the schema once per class; tests share the file and tearDown
+        # empties the tables they write to.
+        cls.db_path = bootstrap_db(cls.__name__)
+        DBManager()
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            teardown_db()
+        finally:
+            super().tearDownClass()
 
     def tearDown(self):
+        conn = DBManager()._get_connection()
         try:
-            self._tmp.cleanup()
+            conn.executescript(
+                """
+                DELETE FROM emails;
+                DELETE FROM account_identities;
+                DELETE FROM accounts;
+                """
+            )
         finally:
-            os.environ.pop("TELEGRAMAIL_DB_PATH", None)
+            conn.close()
 
     def test_execute_db_transaction_persists_delivered_to_json(self):
-        from app.email_utils.account_manager import AccountManager
-        from app.email_utils.imap_client import IMAPClient
-        from app.database import DBManager
-
-        account_mgr = AccountManager()
-        self.assertTrue(
-            account_mgr.add_account(
-                {
-                    "email": "a@example.com",
-                    "password": "pw",
-                    "imap_server": "imap.example.com",
-                    "imap_port": 993,
-                    "imap_ssl": True,
-                    "smtp_server": "smtp.example.com",
-                    "smtp_port": 465,
-                    "smtp_ssl": True,
-                    "alias": "Work",
-                    "tg_group_id": 123,
-                }
-            )
-        )
-        account = account_mgr.get_account(email="a@example.com", smtp_server="smtp.example.com")
+        account = create_test_account()
 
         imap = IMAPClient(account)
         delivered_to = ["b+tag@example.com", "b@example.com"]
@@ -72,37 +66,18 @@ class TestImapDeliveredToStore(unittest.TestCase):
 
         db = DBManager()
         conn = db._get_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT delivered_to FROM emails WHERE id = ?", (email_db_id,))
-        row = cur.fetchone()
-        conn.close()
+        conn.row_factory = sqlite3.Row
+        try:
+            row = conn.execute(
+                "SELECT delivered_to FROM emails WHERE id = ?", (email_db_id,)
+            ).fetchone()
+        finally:
+            conn.close()
 
-        self.assertEqual(json.loads(row[0]), delivered_to)
+        self.assertEqual(json.loads(row["delivered_to"]), delivered_to)
 
     def test_execute_db_transaction_skips_cross_mailbox_duplicate_by_message_id(self):
-        from app.email_utils.account_manager import AccountManager
-        from app.email_utils.imap_client import IMAPClient
-
-        account_mgr = AccountManager()
-        self.assertTrue(
-            account_mgr.add_account(
-                {
-                    "email": "a@example.com",
-                    "password": "pw",
-                    "imap_server": "imap.example.com",
-                    "imap_port": 993,
-                    "imap_ssl": True,
-                    "smtp_server": "smtp.example.com",
-                    "smtp_port": 465,
-                    "smtp_ssl": True,
-                    "alias": "Work",
-                    "tg_group_id": 123,
-                }
-            )
-        )
-        account = account_mgr.get_account(
-            email="a@example.com", smtp_server="smtp.example.com"
-        )
+        account = create_test_account()
         imap = IMAPClient(account)
 
         first = {
@@ -1,6 +1,11 @@
 import asyncio
-import time
+import collections
+import functools
+import threading
 import unittest
+from unittest import mock
+
+from app.cron.imap_idle_manager import IMAPIdleManager
 
 
 class _FakeConn:
@@ -9,16 +14,17 @@ class _FakeConn:
 
 
 class _FakeIMAPClient:
-    connect_results = []
-
-    def __init__(self, account):
+    def __init__(self, account, connect_results=None):
         self.account = account
         self.conn = _FakeConn()
+        # The manager builds a new client per reconnect, so the per-test deque
+        # is shared by reference rather than copied.
+        self._connect_results = (
+            connect_results if connect_results is not None else collections.deque()
+        )
 
     def connect(self):
-        if self.connect_results:
-            return self.connect_results.pop(0)
-        return True
+        return self._connect_results.popleft() if self._connect_results else True
 
     def disconnect(self):
         return None
@@ -29,9 +35,6 @@ class _FakeIMAPClient:
 
 class TestImapIdleManager(unittest.IsolatedAsyncioTestCase):
     async def test_falls_back_to_short_poll_when_idle_unsupported(self):
-        from app.cron.imap_idle_manager import IMAPIdleManager
-
-        _FakeIMAPClient.connect_results = [True]
         fetch_calls = []
         sleep_calls = []
 
@@ -43,7 +46,10 @@ class TestImapIdleManager(unittest.IsolatedAsyncioTestCase):
             manager._running = False
 
         manager = IMAPIdleManager(
-            imap_client_cls=_FakeIMAPClient,
+            account_manager=mock.Mock(),
+            imap_client_cls=functools.partial(
+                _FakeIMAPClient, connect_results=collections.deque([True])
+            ),
             supports_idle_fn=lambda _conn: False,
             idle_wait_once_fn=lambda *_args, **_kwargs: False,
             fetch_account_emails_fn=_fake_fetch,
@@ -59,9 +65,6 @@ class TestImapIdleManager(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(sleep_calls, [30])
 
     async def test_reconnect_backoff_grows_exponentially_before_success(self):
-        from app.cron.imap_idle_manager import IMAPIdleManager
-
-        _FakeIMAPClient.connect_results = [False, False, True]
         fetch_calls = []
         sleep_calls = []
 
@@ -70,11 +73,16 @@ class TestImapIdleManager(unittest.IsolatedAsyncioTestCase):
 
         async def _fake_sleep(seconds):
             sleep_calls.append(seconds)
-            if len(sleep_calls) >= 3:
+            if len(sleep_calls) == 3:
+                # The loop re-checks _running right after this sleep, so no
+                # further connect or sleep happens.
                 manager._running = False
 
         manager = IMAPIdleManager(
-            imap_client_cls=_FakeIMAPClient,
+            account_manager=mock.Mock(),
+            imap_client_cls=functools.partial(
+                _FakeIMAPClient, connect_results=collections.deque([False, False, True])
+            ),
             supports_idle_fn=lambda _conn: False,
             idle_wait_once_fn=lambda *_args, **_kwargs: False,
             fetch_account_emails_fn=_fake_fetch,
@@ -86,14 +94,14 @@ class TestImapIdleManager(unittest.IsolatedAsyncioTestCase):
 
         await manager._run_watcher({"id": 1, "email": "a@example.com"}, "INBOX")
 
-        self.assertEqual(sleep_calls[:3], [5, 10, 30])
+        self.assertEqual(sleep_calls, [5, 10, 30])
         self.assertEqual(fetch_calls, ["a@example.com"])
 
     async def test_idle_wait_does_not_block_event_loop(self):
-        from app.cron.imap_idle_manager import IMAPIdleManager
-
-        _FakeIMAPClient.connect_results = [True]
-        tick_elapsed = {"value": None}
+        loop = asyncio.get_running_loop()
+        idle_started = asyncio.Event()
+        tick_done = threading.Event()
+        order = []
 
         async def _fake_fetch(_account):
             return 0
@@ -102,10 +110,23 @@ class TestImapIdleManager(unittest.IsolatedAsyncioTestCase):
             # This path is not expected in this scenario.
             return None
 
+        def _blocking_idle_wait(*_args, **_kwargs):
+            # Blocks until _tick has run on the event loop. If the wait ran on
+            # the loop thread itself, _tick could not run and this would only
+            # return on timeout.
+            loop.call_soon_threadsafe(idle_started.set)
+            tick_done.wait(timeout=2.0)
+            order.append("idle_wait")
+            manager._running = False
+            return False
+
         manager = IMAPIdleManager(
-            imap_client_cls=_FakeIMAPClient,
+            account_manager=mock.Mock(),
+            imap_client_cls=functools.partial(
+                _FakeIMAPClient, connect_results=collections.deque([True])
+            ),
             supports_idle_fn=lambda _conn: True,
-            idle_wait_once_fn=lambda *_args, **_kwargs: _blocking_idle_wait(manager),
+            idle_wait_once_fn=_blocking_idle_wait,
             fetch_account_emails_fn=_fake_fetch,
             fallback_poll_seconds=30,
             reconnect_backoff_seconds=5,
@@ -113,11 +134,11 @@ class TestImapIdleManager(unittest.IsolatedAsyncioTestCase):
         )
         manager._running = True
 
-        started_at = time.monotonic()
-
         async def _tick():
-            await asyncio.sleep(0.05)
-            tick_elapsed["value"] = time.monotonic() - started_at
+            # Wake as soon as the wait is running instead of on a fixed timer.
+            await idle_started.wait()
+            order.append("tick")
+            tick_done.set()
 
         tick_task = asyncio.create_task(_tick())
         watcher_task = asyncio.create_task(
@@ -126,19 +147,10 @@ class TestImapIdleManager(unittest.IsolatedAsyncioTestCase):
 
         await asyncio.gather(tick_task, watcher_task)
 
-        self.assertIsNotNone(tick_elapsed["value"])
-        self.assertLess(
-            tick_elapsed["value"],
-            0.15,
-            f"event loop was blocked by idle wait: {tick_elapsed['value']:.3f}s",
+        self.assertEqual(
+            order, ["tick", "idle_wait"], "event loop was blocked by idle wait"
         )
 
 
-def _blocking_idle_wait(manager):
-    time.sleep(0.2)
-    manager._running = False
-    return False
-
-
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,7 @@
 import unittest
+from unittest import mock
+
+from app.email_utils.imap_client import IMAPClient
 
 
 class _FakeConn:
@@ -15,9 +18,13 @@ class _FakeConn:
 
 
 class TestImapListMailboxes(unittest.TestCase):
-    def test_list_mailboxes_parses_common_formats_and_filters_noselect(self):
-        from app.email_utils.imap_client import IMAPClient
+    def setUp(self):
+        # Keep IMAPClient off the default on-disk database; these tests never store.
+        patcher = mock.patch("app.email_utils.imap_client.DBManager")
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
+    def test_list_mailboxes_parses_common_formats_and_filters_noselect(self):
         client = IMAPClient(account={"id": 1, "email": "a@example.com"})
         client.conn = _FakeConn(
             [
@@ -39,3 +46,26 @@ class TestImapListMailboxes(unittest.TestCase):
         self.assertTrue(any(b["name"] == "INBOX" for b in selectable))
         self.assertFalse(any(b["name"] == "Archive" for b in selectable))
 
+    def test_resolve_sent_mailbox_parses_bare_delimiter_lines(self):
+        client = IMAPClient(account={"id": 1, "email": "a@example.com"})
+        client.conn = _FakeConn(
+            [
+                b'(\\HasNoChildren) "/" "INBOX"',
+                b'(\\HasNoChildren) NIL "Sent Items"',
+            ]
+        )
+
+        with mock.patch.dict("os.environ", {"TELEGRAMAIL_IMAP_SENT_MAILBOX": ""}):
+            self.assertEqual(client._resolve_sent_mailbox(), "Sent Items")
+
+    def test_resolve_sent_mailbox_prefers_special_use_attribute_over_name(self):
+        client = IMAPClient(account={"id": 1, "email": "a@example.com"})
+        client.conn = _FakeConn(
+            [
+                b'(\\HasNoChildren) "/" "Sent Items"',
+                b'(\\HasNoChildren \\Sent) "/" "Gesendet"',
+            ]
+        )
+
+        with mock.patch.dict("os.environ", {"TELEGRAMAIL_IMAP_SENT_MAILBOX": ""}):
+            self.assertEqual(client._resolve_sent_mailbox(), "Gesendet")
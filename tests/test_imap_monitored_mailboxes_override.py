@@ -1,15 +1,19 @@
 import os
 import unittest
+from unittest import mock
 
 
 class TestImapMonitoredMailboxesOverride(unittest.TestCase):
-    def tearDown(self):
-        os.environ.pop("TELEGRAMAIL_IMAP_MONITORED_MAILBOXES", None)
+    def setUp(self):
+        # Keep IMAPClient off the default on-disk database; these tests never store.
+        patcher = mock.patch("app.email_utils.imap_client.DBManager")
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
+    @mock.patch.dict(os.environ, {"TELEGRAMAIL_IMAP_MONITORED_MAILBOXES": "INBOX,Archive"})
     def test_account_override_takes_precedence_over_env(self):
         from app.email_utils.imap_client import IMAPClient
 
-        os.environ["TELEGRAMAIL_IMAP_MONITORED_MAILBOXES"] = "INBOX,Archive"
         client = IMAPClient(
             account={
                 "id": 1,
@@ -20,13 +24,14 @@ class TestImapMonitoredMailboxesOverride(unittest.TestCase):
 
         self.assertEqual(client._get_monitored_mailboxes(), ["Spam"])
 
+    @mock.patch.dict(os.environ, {"TELEGRAMAIL_IMAP_MONITORED_MAILBOXES": "INBOX,Archive"})
     def test_env_is_used_when_account_override_missing(self):
         from app.email_utils.imap_client import IMAPClient
 
-        os.environ["TELEGRAMAIL_IMAP_MONITORED_MAILBOXES"] = "INBOX,Archive"
         client = IMAPClient(account={"id": 1, "email": "a@example.com"})
         self.assertEqual(client._get_monitored_mailboxes(), ["INBOX", "Archive"])
 
+    @mock.patch.dict(os.environ, {"TELEGRAMAIL_IMAP_MONITORED_MAILBOXES": ""})
     def test_defaults_to_inbox_when_both_missing(self):
         from app.email_utils.imap_client import IMAPClient
 
@@ -2,6 +2,8 @@ import os
 import unittest
 from types import SimpleNamespace
 
+from app.llm.openai import OpenAIClient
+
 
 class _FakeChatCompletions:
     def __init__(self):
@@ -24,8 +26,6 @@ class TestOpenAIClient(unittest.TestCase):
         os.environ.setdefault("OPENAI_BASE_URL", "http://example.invalid")
         os.environ.setdefault("OPENAI_API_KEY", "sk-test")
 
-        from app.llm.openai import OpenAIClient
-
         client = OpenAIClient()
         fake_completions = _FakeChatCompletions()
         client.client = _FakeOpenAIClient(fake_completions)
@@ -1,93 +1,52 @@
 import json
-import os
-import tempfile
 import unittest
 
+from app.bot.handlers.callback import callback_handler
+from app.database import DBManager
 
-class _FakeCallbackPayload:
-    def __init__(self, data: bytes):
-        self.data = data
+from tests._fakes import FakeApi, FakeCallbackUpdate, FakeClient, FakeSentMessage
+from tests._fixtures import bootstrap_db, create_test_account, teardown_db
 
 
-class _FakeCallbackUpdate:
-    def __init__(self, *, chat_id: int, user_id: int, message_id: int, data: str):
-        self.chat_id = chat_id
-        self.sender_user_id = user_id
-        self.message_id = message_id
-        self.payload = _FakeCallbackPayload(data=data.encode("utf-8"))
-        self.id = 1
-
-
-class _FakeApi:
+class _FakeApi(FakeApi):
     def __init__(self):
+        super().__init__()
         self.sent = []
 
-    async def answer_callback_query(self, callback_query_id: int, text: str, url: str, cache_time: int):
-        return None
-
     async def send_message(self, **kwargs):
         # Record call and return object with id
         self.sent.append(kwargs)
-        return type("Msg", (), {"id": 999})
-
-
-class _FakeClient:
-    def __init__(self):
-        self.api = _FakeApi()
-        self.edits = []
-
-    async def edit_text(self, **kwargs):
-        self.edits.append(kwargs)
+        return FakeSentMessage(999)
 
 
 class TestReplyForwardCallbacks(unittest.IsolatedAsyncioTestCase):
-    def setUp(self):
-        self._tmp = tempfile.TemporaryDirectory()
-        self.db_path = os.path.join(self._tmp.name, "telegramail-test.db")
-        os.environ["TELEGRAMAIL_DB_PATH"] = self.db_path
-
-        from app.database import DBManager
-        from app.email_utils.account_manager import AccountManager
-
-        DBManager.reset_instance()
-        AccountManager.reset_instance()
-
-        from app.email_utils.account_manager import AccountManager as AM
-
-        self.account_mgr = AM()
-        self.assertTrue(
-            self.account_mgr.add_account(
-                {
-                    "email": "a@example.com",
-                    "password": "pw",
-                    "imap_server": "imap.example.com",
-                    "imap_port": 993,
-                    "imap_ssl": True,
-                    "smtp_server": "smtp.example.com",
-                    "smtp_port": 465,
-                    "smtp_ssl": True,
-                    "alias": "Work",
-                    "tg_group_id": 123,
-                }
-            )
-        )
-        self.account = self.account_mgr.get_account(
-            email="a@example.com", smtp_server="smtp.example.com"
-        )
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Build the schema, the account and its alias identity once per class;
+        # each test inserts its email row in setUp and tearDown clears what
+        # the test created.
+        cls.db_path = bootstrap_db(cls.__name__)
+        cls.account = create_test_account()
 
         # Add an alias identity b@example.com so plus-address can map to base.
-        from app.database import DBManager as DB
-
-        DB().upsert_account_identity(
-            account_id=self.account["id"],
+        DBManager().upsert_account_identity(
+            account_id=cls.account["id"],
             from_email="b@example.com",
             display_name="Work",
             is_default=False,
         )
 
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            teardown_db()
+        finally:
+            super().tearDownClass()
+
+    def setUp(self):
         # Insert an email row with delivered_to = b+tag@example.com
-        db = DB()
-        conn = db._get_connection()
+        conn = DBManager()._get_connection()
         cur = conn.cursor()
         cur.execute(
             """
@@ -116,17 +75,23 @@ class TestReplyForwardCallbacks(unittest.IsolatedAsyncioTestCase):
         conn.close()
 
     def tearDown(self):
+        conn = DBManager()._get_connection()
         try:
-            self._tmp.cleanup()
+            conn.executescript(
+                """
+                DELETE FROM draft_attachments;
+                DELETE FROM draft_messages;
+                DELETE FROM drafts;
+                DELETE FROM identity_suggestions;
+                DELETE FROM emails;
+                """
+            )
         finally:
-            os.environ.pop("TELEGRAMAIL_DB_PATH", None)
+            conn.close()
 
     async def test_reply_callback_creates_draft_with_recommended_from_identity(self):
-        from app.bot.handlers.callback import callback_handler
-        from app.database import DBManager
-
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient(_FakeApi())
+        update = FakeCallbackUpdate(
             chat_id=123,
             user_id=1,
             message_id=10,
@@ -146,11 +111,8 @@ class TestReplyForwardCallbacks(unittest.IsolatedAsyncioTestCase):
     async def test_forward_callback_creates_draft_with_forward_header_and_recommended_identity(
         self,
     ):
-        from app.bot.handlers.callback import callback_handler
-        from app.database import DBManager
-
-        client = _FakeClient()
-        update = _FakeCallbackUpdate(
+        client = FakeClient(_FakeApi())
+        update = FakeCallbackUpdate(
             chat_id=123,
             user_id=1,
             message_id=10,
@@ -1,9 +1,28 @@
-import os
-import tempfile
 import unittest
+import uuid
+
+from tests._fixtures import bootstrap_db, teardown_db
 
 
 class TestSignatureStore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from app.email_utils.signatures import add_account_signature
+
+        # Two-signature store shared by the tests below; they only derive new
+        # raw values from it, never mutate it.
+        raw, cls.first_id = add_account_signature(
+            None,
+            name="Work",
+            markdown="Work signature",
+        )
+        cls.two_sig_raw, cls.second_id = add_account_signature(
+            raw,
+            name="Personal",
+            markdown="Personal signature",
+        )
+
     def test_legacy_markdown_is_supported(self):
         from app.email_utils.signatures import list_account_signatures
 
@@ -14,50 +33,28 @@ class TestSignatureStore(unittest.TestCase):
 
     def test_add_and_switch_default_signature(self):
         from app.email_utils.signatures import (
-            add_account_signature,
             list_account_signatures,
             set_default_account_signature,
         )
 
-        raw, first_id = add_account_signature(
-            None,
-            name="Work",
-            markdown="Work signature",
-        )
-        raw, second_id = add_account_signature(
-            raw,
-            name="Personal",
-            markdown="Personal signature",
-        )
-        raw = set_default_account_signature(raw, second_id)
+        raw = set_default_account_signature(self.two_sig_raw, self.second_id)
 
         items, default_id = list_account_signatures(raw)
         self.assertEqual(len(items), 2)
-        self.assertEqual(default_id, second_id)
-        self.assertEqual(first_id != second_id, True)
+        self.assertEqual(default_id, self.second_id)
+        self.assertNotEqual(self.first_id, self.second_id)
 
     def test_resolve_signature_can_choose_specific_or_none(self):
         from app.email_utils.signatures import (
             CHOICE_NONE,
-            add_account_signature,
             resolve_signature_for_send,
             set_default_account_signature,
         )
 
-        raw, first_id = add_account_signature(
-            None,
-            name="Default",
-            markdown="Default signature",
-        )
-        raw, second_id = add_account_signature(
-            raw,
-            name="Alt",
-            markdown="Alt signature",
-        )
-        raw = set_default_account_signature(raw, first_id)
+        raw = set_default_account_signature(self.two_sig_raw, self.first_id)
 
-        selected, _label = resolve_signature_for_send(raw, second_id)
-        self.assertEqual(selected, "Alt signature")
+        selected, _label = resolve_signature_for_send(raw, self.second_id)
+        self.assertEqual(selected, "Personal signature")
 
         selected_none, _label_none = resolve_signature_for_send(raw, CHOICE_NONE)
         self.assertIsNone(selected_none)
@@ -65,20 +62,10 @@ class TestSignatureStore(unittest.TestCase):
 
 class TestSignatureStatePersistence(unittest.TestCase):
     def setUp(self):
-        self._tmp = tempfile.TemporaryDirectory()
-        self.db_path = os.path.join(self._tmp.name, "telegramail-test.db")
-        os.environ["TELEGRAMAIL_DB_PATH"] = self.db_path
-        from app.database import DBManager
-        from app.email_utils.account_manager import AccountManager
-
-        DBManager.reset_instance()
-        AccountManager.reset_instance()
+        self.db_path = bootstrap_db(f"telegramail-test-{uuid.uuid4().hex}")
 
     def tearDown(self):
-        try:
-            self._tmp.cleanup()
-        finally:
-            os.environ.pop("TELEGRAMAIL_DB_PATH", None)
+        teardown_db()
 
     def test_draft_signature_choice_is_persisted(self):
         from app.database import DBManager
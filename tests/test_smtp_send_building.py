@@ -1,24 +1,38 @@
+import hashlib
 import unittest
-from email import message_from_string
+from itertools import islice
 from unittest import mock
 
+from app.email_utils.smtp_client import SMTPClient, build_email_message
+
 
 class _FakeSMTP:
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, capture: str = "full", **kwargs):
+        # "full" keeps (from, recipients, message); "summary" keeps only
+        # (from, recipient count, message digest) for large fan-out tests.
+        self.capture = capture
         self.sent = []
+        self.quit_calls = 0
 
     def ehlo(self):
         return None
 
+    def starttls(self):
+        return None
+
     def login(self, username, password):
         return None
 
     def sendmail(self, from_addr, to_addrs, msg):
-        self.sent.append((from_addr, list(to_addrs), msg))
+        if self.capture == "summary":
+            digest = hashlib.blake2b(msg.encode("utf-8"), digest_size=16).digest()
+            self.sent.append((from_addr, len(to_addrs), digest))
+        else:
+            self.sent.append((from_addr, tuple(to_addrs), msg))
         return {}
 
     def quit(self):
-        return None
+        self.quit_calls += 1
 
     def __enter__(self):
         return self
@@ -29,10 +43,18 @@ class _FakeSMTP:
 
 
 class TestSmtpClient(unittest.TestCase):
-    def test_builds_multipart_alternative_with_headers(self):
-        from app.email_utils.smtp_client import build_email_message
-
-        msg = build_email_message(
+    # (recipients, To, Cc) per delivery in test_chunks_large_bcc_without_dup_to_cc.
+    _EXPECTED_BCC_CHUNK_SENDS = (
+        (("to@example.com", "cc@example.com"), "to@example.com", "cc@example.com"),
+        (("b1@example.com", "b2@example.com"), "b@example.com", None),
+        (("b3@example.com",), "b@example.com", None),
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # The assertion tests only read these messages, so build them once.
+        cls.msg_headers = build_email_message(
             from_email="b@example.com",
             from_name="Work",
             to_addrs=["to@example.com"],
@@ -45,6 +67,39 @@ class TestSmtpClient(unittest.TestCase):
             references=["<r1@example.com>", "<r2@example.com>"],
         )
 
+        cls.msg_attach = build_email_message(
+            from_email="b@example.com",
+            from_name="Work",
+            to_addrs=["to@example.com"],
+            subject="Hello",
+            text_body="plain",
+            html_body="<p>html</p>",
+            attachments=[
+                {"filename": "a.txt", "mime_type": "text/plain", "data": b"abc"},
+            ],
+        )
+
+        # Construction does no I/O, so the SSL chunking tests share one client;
+        # setUp restores the recipient limit they adjust.
+        cls.client = SMTPClient(
+            server="smtp.example.com",
+            port=465,
+            username="a@example.com",
+            password="pw",
+            use_ssl=True,
+        )
+
+    def setUp(self):
+        patcher = mock.patch("smtplib.SMTP_SSL")
+        self.mock_smtp_cls = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.fake = _FakeSMTP()
+        self.mock_smtp_cls.return_value = self.fake
+        self.client.max_recipients_per_email = 50
+
+    def test_builds_multipart_alternative_with_headers(self):
+        msg = self.msg_headers
+
         self.assertEqual(msg["From"], "Work <b@example.com>")
         self.assertEqual(msg["To"], "to@example.com")
         self.assertEqual(msg["Cc"], "cc@example.com")
@@ -55,19 +110,16 @@ class TestSmtpClient(unittest.TestCase):
         self.assertTrue(msg.is_multipart())
 
     def test_chunks_large_bcc_without_dup_to_cc(self):
-        from app.email_utils.smtp_client import SMTPClient
-
-        fake = _FakeSMTP()
-        with mock.patch("smtplib.SMTP_SSL", return_value=fake):
-            client = SMTPClient(
-                server="smtp.example.com",
-                port=465,
-                username="a@example.com",
-                password="pw",
-                use_ssl=True,
-                max_recipients_per_email=2,
-            )
+        client = self.client
+        client.max_recipients_per_email = 2
+        # Capture the built messages before serialization: only headers are
+        # checked, so there is no need to render and re-parse the MIME text.
+        captured = []
 
+        def _capture(smtp, from_email, recipients, message):
+            captured.append((recipients, message))
+
+        with mock.patch.object(SMTPClient, "_send_message", side_effect=_capture):
             client.send_email_sync(
                 from_email="b@example.com",
                 from_name="Work",
@@ -80,55 +132,105 @@ class TestSmtpClient(unittest.TestCase):
             )
 
         # First: To/Cc only (no bcc), then bcc chunks of size 2 and 1.
-        self.assertEqual(len(fake.sent), 3)
-
-        # 1) To/Cc only
-        _from, rcpt1, msg1 = fake.sent[0]
-        self.assertEqual(set(rcpt1), {"to@example.com", "cc@example.com"})
-        parsed1 = message_from_string(msg1)
-        self.assertEqual(parsed1["To"], "to@example.com")
-        self.assertEqual(parsed1["Cc"], "cc@example.com")
-        self.assertIsNone(parsed1.get("Bcc"))
-
-        # 2) Bcc chunk 1 (2 recipients)
-        _from, rcpt2, msg2 = fake.sent[1]
-        self.assertEqual(set(rcpt2), {"b1@example.com", "b2@example.com"})
-        parsed2 = message_from_string(msg2)
-        self.assertEqual(parsed2["To"], "b@example.com")
-        self.assertIsNone(parsed2.get("Cc"))
-        self.assertIsNone(parsed2.get("Bcc"))
-
-        # 3) Bcc chunk 2 (1 recipient)
-        _from, rcpt3, msg3 = fake.sent[2]
-        self.assertEqual(set(rcpt3), {"b3@example.com"})
-        parsed3 = message_from_string(msg3)
-        self.assertEqual(parsed3["To"], "b@example.com")
-        self.assertIsNone(parsed3.get("Cc"))
-        self.assertIsNone(parsed3.get("Bcc"))
-
-    def test_builds_multipart_with_attachments(self):
-        from app.email_utils.smtp_client import build_email_message
-
-        msg = build_email_message(
+        self.assertEqual(len(captured), len(self._EXPECTED_BCC_CHUNK_SENDS))
+        for i, (expected_rcpt, expected_to, expected_cc) in enumerate(
+            self._EXPECTED_BCC_CHUNK_SENDS
+        ):
+            rcpt, msg = captured[i]
+            with self.subTest(send=i):
+                # Multiset comparison: a recipient sent twice must fail.
+                self.assertCountEqual(rcpt, expected_rcpt)
+                self.assertEqual(msg["To"], expected_to)
+                self.assertEqual(msg.get("Cc"), expected_cc)
+                self.assertIsNone(msg.get("Bcc"))
+
+    def test_chunks_many_bcc_recipients_by_max_per_email(self):
+        self.fake = _FakeSMTP(capture="summary")
+        self.mock_smtp_cls.return_value = self.fake
+        client = self.client
+
+        ok = client.send_email_sync(
             from_email="b@example.com",
             from_name="Work",
             to_addrs=["to@example.com"],
+            cc_addrs=["cc@example.com"],
+            bcc_addrs=[f"b{i}@example.com" for i in range(1000)],
             subject="Hello",
             text_body="plain",
             html_body="<p>html</p>",
-            attachments=[
-                {"filename": "a.txt", "mime_type": "text/plain", "data": b"abc"},
-            ],
         )
 
-        raw = msg.as_string()
-        parsed = message_from_string(raw)
-        self.assertTrue(parsed.is_multipart())
-        # There should be a part with attachment disposition.
-        attachments = [
-            p
-            for p in parsed.walk()
-            if p.get_content_disposition() == "attachment"
-        ]
+        self.assertTrue(ok)
+        # One To/Cc send, then 1000 bcc recipients in chunks of 50.
+        counts = [count for _from, count, _digest in self.fake.sent]
+        self.assertEqual(counts, [2] + [50] * 20)
+
+    def test_send_count_follows_max_recipients_per_email(self):
+        client = self.client
+        # (max_recipients_per_email, expected sends) for 1 To + 1 Cc + 5 Bcc.
+        configs = [(1, 6), (2, 4), (5, 2), (7, 1), (50, 1)]
+        for max_rcpt, expected_sends in configs:
+            with self.subTest(max_recipients_per_email=max_rcpt):
+                self.fake.sent.clear()
+                client.max_recipients_per_email = max_rcpt
+
+                client.send_email_sync(
+                    from_email="b@example.com",
+                    from_name="Work",
+                    to_addrs=["to@example.com"],
+                    cc_addrs=["cc@example.com"],
+                    bcc_addrs=[f"b{i}@example.com" for i in range(5)],
+                    subject="Hello",
+                    text_body="plain",
+                    html_body="<p>html</p>",
+                )
+
+                self.assertEqual(len(self.fake.sent), expected_sends)
+
+    def test_chunked_send_reuses_one_smtp_session(self):
+        plain_patcher = mock.patch("smtplib.SMTP")
+        mock_plain_cls = plain_patcher.start()
+        self.addCleanup(plain_patcher.stop)
+
+        for use_ssl, smtp_cls in ((True, self.mock_smtp_cls), (False, mock_plain_cls)):
+            with self.subTest(use_ssl=use_ssl):
+                fake = _FakeSMTP()
+                smtp_cls.return_value = fake
+                client = SMTPClient(
+                    server="smtp.example.com",
+                    port=465 if use_ssl else 587,
+                    username="a@example.com",
+                    password="pw",
+                    use_ssl=use_ssl,
+                    max_recipients_per_email=2,
+                )
+
+                ok = client.send_email_sync(
+                    from_email="b@example.com",
+                    from_name="Work",
+                    to_addrs=["to@example.com"],
+                    cc_addrs=["cc@example.com"],
+                    bcc_addrs=["b1@example.com", "b2@example.com", "b3@example.com"],
+                    subject="Hello",
+                    text_body="plain",
+                )
+
+                self.assertTrue(ok)
+                self.assertEqual(len(fake.sent), 3)
+                # All three deliveries go over a single connection, closed once.
+                self.assertEqual(smtp_cls.call_count, 1)
+                self.assertEqual(fake.quit_calls, 1)
+
+    def test_builds_multipart_with_attachments(self):
+        msg = self.msg_attach
+        self.assertTrue(msg.is_multipart())
+        # There should be a part with attachment disposition; two matches are
+        # enough to prove "exactly one", so stop walking there.
+        attachments = list(
+            islice(
+                (p for p in msg.walk() if p.get_content_disposition() == "attachment"),
+                2,
+            )
+        )
         self.assertEqual(len(attachments), 1)
         self.assertEqual(attachments[0].get_filename(), "a.txt")